@@ -0,0 +1,90 @@
+"""
+Serialization overhead per 10k rows for the /predict/batch wire formats (JSON, msgpack, Arrow IPC).
+Measures client-side encode, server-side decode into column arrays and response encode; no model call.
+e.g: python scripts/bench_serialization.py --rows 10000 --repeat 20
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from utils.schema import ALLOWED_VALUES
+from serving.wire import JSON_MIME, ARROW_MIME, MSGPACK_MIMES, decode_columns, encode_result, pa, msgpack
+
+def make_columns(n: int) -> dict:
+    rng = np.random.default_rng(42)
+    columns = {f: rng.choice(levels, n).tolist() for f, levels in ALLOWED_VALUES.items()}
+    columns["SeniorCitizen"] = rng.integers(0, 2, n).tolist()
+    columns["tenure"] = rng.integers(0, 73, n).tolist()
+    columns["MonthlyCharges"] = rng.uniform(18, 120, n).round(2).tolist()
+    columns["TotalCharges"] = rng.uniform(18, 8000, n).round(2).tolist()
+    return columns
+
+def make_result(n: int) -> dict:
+    rng = np.random.default_rng(0)
+    proba = rng.random(n)
+    return {
+        "n_rows": n,
+        "n_valid": n,
+        "prediction": np.where(proba > 0.5, "Likely to Churn", "Not Likely to Churn").astype(object),
+        "churn_probability": proba,
+        "errors": [],
+    }
+
+def encode_request(columns: dict, media_type: str) -> bytes:
+    if media_type == ARROW_MIME:
+        # Categorical fields go over the wire dictionary-encoded
+        table = pa.table({
+            f: pa.array(v).dictionary_encode() if f in ALLOWED_VALUES else pa.array(v)
+            for f, v in columns.items()
+        })
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    if media_type in MSGPACK_MIMES:
+        return msgpack.packb({"columns": columns}, use_bin_type=True)
+    return json.dumps({"columns": columns}).encode()
+
+def _best_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def main(args):
+
+    columns = make_columns(args.rows)
+    result = make_result(args.rows)
+    scale = 10000 / args.rows
+
+    formats = [("json", JSON_MIME)]
+    if msgpack is not None:
+        formats.append(("msgpack", MSGPACK_MIMES[0]))
+    if pa is not None:
+        formats.append(("arrow", ARROW_MIME))
+
+    print(f" Serialization overhead per 10k rows (best of {args.repeat}, {args.rows} rows measured)")
+    print(f" {'format':<8} {'req KB':>8} {'encode ms':>10} {'decode ms':>10} {'resp KB':>8} {'resp ms':>8}")
+    for name, media_type in formats:
+        body = encode_request(columns, media_type)
+        response = encode_result(result, media_type)
+
+        enc = _best_ms(lambda: encode_request(columns, media_type), args.repeat) * scale
+        dec = _best_ms(lambda: decode_columns(body, media_type), args.repeat) * scale
+        resp = _best_ms(lambda: encode_result(result, media_type), args.repeat) * scale
+
+        print(f" {name:<8} {len(body) * scale / 1024:>8.0f} {enc:>10.2f} {dec:>10.2f} {len(response) * scale / 1024:>8.0f} {resp:>8.2f}")
+
+if __name__ == "__main__" :
+    p = argparse.ArgumentParser(description= " Benchmark batch wire formats")
+    p.add_argument("--rows", type=int, default=10000)
+    p.add_argument("--repeat", type=int, default=20)
+    args = p.parse_args()
+    main(args)
@@ -0,0 +1,58 @@
+"""
+Single-row and batch latency of the numpy tree predictor vs XGBoost on the deployed model.
+e.g: python scripts/bench_tree_predictor.py --rows 100000 --repeat 5
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+from xgboost import XGBClassifier
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from models.export_trees import export_booster
+from serving.tree_predictor import TreeEnsemblePredictor
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "app", "models", "m-e2655f75ee9a490ab154aef6b4cfbe19", "artifacts")
+
+def _best_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def main(args):
+
+    model = XGBClassifier()
+    model.load_model(os.path.join(MODEL_DIR, "model.ubj"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trees.npz")
+        export_booster(model.get_booster(), path)
+        size_kb = os.path.getsize(path) / 1024
+        start = time.perf_counter()
+        predictor = TreeEnsemblePredictor.load(path, block_rows=args.block_rows)
+        load_ms = (time.perf_counter() - start) * 1000
+
+    rng = np.random.default_rng(0)
+    X = (rng.random((args.rows, len(predictor.feature_names))) * 100).astype(np.float32)
+    row = X[:1]
+
+    print(f" trees.npz : {size_kb:.0f} KB | load : {load_ms:.0f} ms | block_rows : {args.block_rows}")
+    print(f" {'backend':<8} {'1 row us':>10} {f'{args.rows} rows ms':>16}")
+    for name, fn in [("numpy", predictor.predict_proba), ("xgboost", model.predict_proba)]:
+        single = _best_ms(lambda: fn(row), args.repeat * 100) * 1000
+        batch = _best_ms(lambda: fn(X), args.repeat)
+        print(f" {name:<8} {single:>10.0f} {batch:>16.0f}")
+
+if __name__ == "__main__" :
+    p = argparse.ArgumentParser(description= " Benchmark the numpy tree predictor")
+    p.add_argument("--rows", type=int, default=100000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--block_rows", type=int, default=1024)
+    args = p.parse_args()
+    main(args)
@@ -0,0 +1,39 @@
+"""
+Scores the whole customer base into a memory-mapped index served by GET /score/{customerID}
+e.g: python scripts/build_score_index.py --input data/raw/Telco-Customer-Churn.csv
+     python scripts/build_score_index.py --input data/raw/changed_customers.csv --refresh
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from serving.score_index import build_score_index, refresh_score_index
+
+def main(args):
+
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__),".."))
+    index_dir = args.index_dir or os.path.join(project_root, "artifacts", "score_index")
+
+    start = time.time()
+    if args.refresh:
+        print(f" Refreshing score index at {index_dir} with customers from {args.input}")
+        n = refresh_score_index(args.input, index_dir, chunksize=args.chunksize)
+    else:
+        print(f" Building score index at {index_dir} from {args.input}")
+        n = build_score_index(args.input, index_dir, chunksize=args.chunksize)
+    print(f" Score index holds {n} customers | {time.time() - start:.2f}s")
+
+if __name__ == "__main__" :
+    p = argparse.ArgumentParser(description= " Precomputed churn score index by customerID")
+    p.add_argument("--input", type=str, required= True,
+                   help=" Customer csv with a customerID column ")
+    p.add_argument("--refresh", action="store_true",
+                   help=" Rescore only the customers in --input and merge them into the current index ")
+    p.add_argument("--index_dir", type=str, default=None,
+                   help=" Defaults to artifacts/score_index ")
+    p.add_argument("--chunksize", type=int, default=50000)
+    args = p.parse_args()
+    main(args)
@@ -0,0 +1,75 @@
+"""
+Offline drift report : compares a customer file or the serving prediction logs
+against the training reference profile
+e.g: python scripts/drift_report.py --input data/raw/new_month.csv
+     python scripts/drift_report.py --logs logs/predictions
+"""
+import os
+import sys
+import json
+import argparse
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from monitoring.drift import DriftMonitor, load_profile
+from monitoring.prediction_log import read_prediction_logs
+
+def main(args):
+
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__),".."))
+    profile_path = args.profile or os.path.join(project_root, "artifacts", "reference_profile.json")
+    profile = load_profile(profile_path)
+    print(f" Loaded reference profile from {profile_path}")
+
+    if args.logs:
+        # Logged probabilities are used as-is, no rescoring needed
+        logs = read_prediction_logs(args.logs)
+        print(f" Loaded {len(logs)} logged predictions from {args.logs}")
+        versions = logs["model_version"].unique().tolist()
+        monitor = DriftMonitor(profile, model_version=versions[0] if len(versions) == 1 else None)
+        monitor.update(logs, logs["probability"].to_numpy())
+    else:
+        model_version = None
+        if args.score:
+            from serving.inference import predict_proba_batch, MODEL_VERSION as model_version
+        monitor = DriftMonitor(profile, model_version=model_version)
+
+        for chunk in pd.read_csv(args.input, chunksize=args.chunksize):
+            chunk.columns = chunk.columns.str.strip()
+            scores = predict_proba_batch(chunk) if args.score else None
+            monitor.update(chunk, scores)
+
+    report = monitor.report()
+    print(f" Compared {report['n_rows']} rows")
+    print(f" {'feature':<20} {'psi':>8} {'ks':>8}  status")
+    rows = list(report["features"].items())
+    if "score" in report:
+        rows.append(("score", report["score"]))
+    for name, r in sorted(rows, key=lambda t: -(t[1]["psi"] or 0)):
+        value = f"{r['psi']:.4f}" if r["psi"] is not None else "-"
+        ks = f"{r['ks']:.4f}" if r["ks"] is not None else "-"
+        print(f" {name:<20} {value:>8} {ks:>8}  {r['status']}")
+    if report.get("score", {}).get("status") == "model_mismatch":
+        print(f" Score drift skipped : profile built for model {report['score']['profile_model_version']}, scores from {report['score']['model_version']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f" Report saved to {args.output}")
+
+if __name__ == "__main__" :
+    p = argparse.ArgumentParser(description= " Data and prediction drift report (PSI / KS)")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--input", type=str,
+                     help=" Path to csv with raw customer records ")
+    src.add_argument("--logs", type=str,
+                     help=" Prediction log folder written by the API e.g: logs/predictions ")
+    p.add_argument("--profile", type=str, default=None,
+                   help=" Reference profile, defaults to artifacts/reference_profile.json ")
+    p.add_argument("--score", action="store_true",
+                   help=" Also score the file with the model to check prediction drift ")
+    p.add_argument("--chunksize", type=int, default=50000)
+    p.add_argument("--output", type=str, default=None)
+    args = p.parse_args()
+    main(args)
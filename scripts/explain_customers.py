@@ -0,0 +1,32 @@
+"""
+Bulk churn driver explanations (XGBoost TreeSHAP) for a customer file
+e.g: python scripts/explain_customers.py --input data/raw/Telco-Customer-Churn.csv --top_n 5
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from serving.explain import explain_file
+
+def main(args):
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+
+    print(f" Explaining customers from {args.input} | top {args.top_n} drivers")
+    start = time.time()
+    n = explain_file(args.input, args.output, top_n=args.top_n, chunksize=args.chunksize)
+    elapsed = time.time() - start
+    print(f" Explained {n} customers in {elapsed:.2f}s ({n/max(elapsed, 1e-9):.0f} rows/s) -> {args.output}")
+
+if __name__ == "__main__" :
+    p = argparse.ArgumentParser(description= " Bulk churn driver explanations")
+    p.add_argument("--input", type=str, required= True,
+                   help=" Path to customer csv e.g: data/raw/Telco-Customer-Churn.csv ")
+    p.add_argument("--top_n", type=int, default=5)
+    p.add_argument("--chunksize", type=int, default=50000)
+    p.add_argument("--output", type=str, default="data/explanations/churn_drivers.csv")
+    args = p.parse_args()
+    main(args)
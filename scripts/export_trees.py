@@ -0,0 +1,37 @@
+"""
+Flattens a logged XGBoost model (model.ubj) into the numpy arrays used by SERVING_BACKEND=numpy
+e.g: python scripts/export_trees.py --model_dir src/app/models/m-e2655f75ee9a490ab154aef6b4cfbe19/artifacts
+"""
+import os
+import sys
+import argparse
+from mlflow.models import Model
+from xgboost import XGBClassifier
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from models.export_trees import export_booster
+
+def main(args):
+
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__),".."))
+    model_dir = args.model_dir or os.path.join(project_root, "src", "app", "models", "m-e2655f75ee9a490ab154aef6b4cfbe19", "artifacts")
+    output = args.output or os.path.join(project_root, "artifacts", "trees.npz")
+
+    model = XGBClassifier()
+    model.load_model(os.path.join(model_dir, "model.ubj"))
+    model_uuid = Model.load(os.path.join(model_dir, "MLmodel")).model_uuid
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    trees = export_booster(model.get_booster(), output, model_version=model_uuid)
+    print(f" Exported {len(trees['roots'])} trees ({len(trees['left'])} nodes, max depth {int(trees['max_depth'])}) to {output}")
+    print(f" File size : {os.path.getsize(output) / 1024:.1f} KB")
+
+if __name__ == "__main__" :
+    p = argparse.ArgumentParser(description= " Export an XGBoost model to flat numpy tree arrays")
+    p.add_argument("--model_dir", type=str, default=None,
+                   help=" MLflow model artifacts folder holding model.ubj and MLmodel ")
+    p.add_argument("--output", type=str, default=None,
+                   help=" Defaults to artifacts/trees.npz ")
+    args = p.parse_args()
+    main(args)
@@ -0,0 +1,35 @@
+"""
+Ranks a customer file by churn risk and keeps the top-K for campaigns, with calibrated probabilities
+e.g: python scripts/rank_customers.py --input data/raw/Telco-Customer-Churn.csv --k 50000
+"""
+import os
+import sys
+import argparse
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from serving.ranking import rank_top_k
+
+def main(args):
+
+    print(f" Ranking customers from {args.input} | top {args.k}")
+    ranked = rank_top_k(args.input, k=args.k, chunksize=args.chunksize, id_col=args.id_col)
+
+    out = pd.DataFrame(ranked)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    out.to_csv(args.output, index=False)
+    print(f" Saved {len(out)} customers to {args.output}")
+
+if __name__ == "__main__" :
+    p = argparse.ArgumentParser(description= " Top-K churn risk ranking for campaign lists")
+    p.add_argument("--input", type=str, required= True,
+                   help=" Path to customer csv e.g: data/raw/Telco-Customer-Churn.csv ")
+    p.add_argument("--k", type=int, default=50000)
+    p.add_argument("--chunksize", type=int, default=50000,
+                   help=" Rows scored per chunk, bounds memory together with k ")
+    p.add_argument("--id_col", type=str, default=None,
+                   help=" Customer id column, defaults to customerID if present ")
+    p.add_argument("--output", type=str, default="data/campaigns/top_k_churn.csv")
+    args = p.parse_args()
+    main(args)
@@ -3,15 +3,10 @@ Runs Sequentially : Load -> Validate -> preprocess -> feature engineering
 """
 import os
 import sys
-import time
 import argparse
 import pandas as pd
 import mlflow
-import json
-import joblib
-import mlflow.sklearn
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report,precision_score, recall_score, f1_score,roc_auc_score
 from xgboost import XGBClassifier
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..")))
@@ -20,6 +15,10 @@ from src.data.load_data import load_data
 from src.data.preprocess import preprocess_data
 from src.features.build_features import build_features
 from src.utils.validate_data import validate_telco_data
+from src.models.params import XGB_PARAMS
+from src.models.finalize import check_data_quality, save_feature_metadata, log_evaluation, finalize_model, print_report
+from src.utils.profiling import StageProfiler
+from src.utils.utils import setup_logger
 
 def main(args):
 
@@ -28,140 +27,112 @@ def main(args):
     mlflow.set_tracking_uri(mlrun_path)
     mlflow.set_experiment(args.experiment)
 
+    log_dir = os.path.join(project_root, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    logger = setup_logger("run_pipeline", os.path.join(log_dir, "pipeline.log"))
+
+    # Per-stage wall / cpu / memory / throughput, cProfile dumps with --profile
+    profile_dir = os.path.join(project_root, "artifacts", "profiles") if args.profile else None
+    profiler = StageProfiler(logger=logger, profile_dir=profile_dir)
+
     with mlflow.start_run():
+        logger.info(f"run_id={mlflow.active_run().info.run_id} input={args.input}")
         mlflow.log_param("model","xgboost")
         mlflow.log_param("threshold", args.threshold)
         mlflow.log_param("test_size", args.test_size)
-
-        print(" Loading Data ..")
-        df = load_data(args.input)
-        print(f" Data loaded : {df.shape[0]} rows, {df.shape[1]} columns")
-
-        print(" Validating Data with great expectataions")
-        is_valid, failed = validate_telco_data(df)
-        mlflow.log_metric("data_quality_pass",int(is_valid))
-
-        if not is_valid:
-            mlflow.log_text(json.dumps(failed, indent = 2 ),artifact_file=" failed_expectataions.json" )
-            raise ValueError(f"Data Quality check failed. issue : {failed}")
-        else:
-            print(" Data Validation Passed .. Logged to Mlflow ..")
-
-        print("Preprocessing data ..")
-        df = preprocess_data(df)
-
-        process_data_path = os.path.join(project_root,"data","processed","Telco_Churn_Processed.csv")
-        os.makedirs(os.path.dirname(process_data_path), exist_ok= True)
-        df.to_csv(process_data_path,index=False)
-        print(f" Processed date and save to {process_data_path} | Shape {df.shape}")
+        mlflow.log_param("calibration", args.calibration)
+        mlflow.log_param("profile", args.profile)
+
+        with profiler.stage("load") as stage:
+            print(" Loading Data ..")
+            df = load_data(args.input)
+            stage["rows"] = len(df)
+            print(f" Data loaded : {df.shape[0]} rows, {df.shape[1]} columns")
+
+        with profiler.stage("validate", rows=len(df)):
+            print(" Validating Data with Great Expectations")
+            is_valid, failed = validate_telco_data(df)
+        check_data_quality(is_valid, failed)
+
+        with profiler.stage("preprocess", rows=len(df)):
+            print("Preprocessing data ..")
+            df = preprocess_data(df)
+
+        with profiler.stage("csv_write", rows=len(df)):
+            process_data_path = os.path.join(project_root,"data","processed","Telco_Churn_Processed.csv")
+            os.makedirs(os.path.dirname(process_data_path), exist_ok= True)
+            df.to_csv(process_data_path,index=False)
+            print(f" Processed date and save to {process_data_path} | Shape {df.shape}")
 
         print(" Building Features")
         target = args.target
         if target not in df.columns:
             raise ValueError(f"Target Column {target} column  not found in the data")
         
-        df_enc = build_features(df, target_col=target)
+        with profiler.stage("build_features", rows=len(df)):
+            df_enc = build_features(df, target_col=target)
 
-        # conversting boolean into integers
-        for c in df_enc.select_dtypes(include=["bool"]).columns:
-            df_enc[c] = df_enc[c].astype(int)
+            # conversting boolean into integers
+            for c in df_enc.select_dtypes(include=["bool"]).columns:
+                df_enc[c] = df_enc[c].astype(int)
         print(f" Feature engineering completed : {df_enc.shape[1]} features")
 
-        #  Svaing Feature metadata
         artifacts_dir = os.path.join(project_root, "artifacts")
-        os.makedirs(artifacts_dir, exist_ok=True)
-
         feature_cols = list(df_enc.drop(columns=[target]).columns)
-
-        # saving Locally for the deployment
-        with open(os.path.join(artifacts_dir, "feature_columns.json"), 'w') as f:
-            json.dump(feature_cols,f)
-
-        with open(os.path.join(artifacts_dir, "feature_columns.txt"), 'w') as f:
-            json.dump("\n".join(feature_cols),f)
-        
-        mlflow.log_text("\n".join(feature_cols),artifact_file="feature_columns.txt")
-
-        preprocesing_artifact ={
-            "feature_columns" : feature_cols,
-            "target" : target
-        }
-        joblib.dump(preprocesing_artifact,os.path.join(artifacts_dir,"preprocessing.pkl"))
-        mlflow.log_artifact(os.path.join(artifacts_dir,"preprocessing.pkl"))
-        print(f"Saved {len(feature_cols)} for the serving consistancy")
+        save_feature_metadata(feature_cols, target, artifacts_dir)
 
         print(" Splitting Data")
-        X = df_enc.drop(columns=[target])
-        y = df_enc[target]
-        X_train, X_test, y_train, y_test = train_test_split(
-            X,y,
-            test_size= args.test_size,
-            stratify=y,
-            random_state=41
-        )
-        print(f" Train : {X_train.shape[0]} samples | Test : {X_test.shape[0]} samples ")
+        with profiler.stage("split", rows=len(df_enc)):
+            X = df_enc.drop(columns=[target])
+            y = df_enc[target]
+            X_train, X_test, y_train, y_test = train_test_split(
+                X,y,
+                test_size= args.test_size,
+                stratify=y,
+                random_state=41
+            )
+            print(f" Train : {X_train.shape[0]} samples | Test : {X_test.shape[0]} samples ")
+
+            # Hold out part of the training data to fit the probability calibrator
+            X_cal, y_cal = None, None
+            if args.calibration != "none":
+                X_train, X_cal, y_train, y_cal = train_test_split(
+                    X_train,y_train,
+                    test_size= args.calibration_size,
+                    stratify=y_train,
+                    random_state=41
+                )
+                print(f" Calibration : {X_cal.shape[0]} samples held out from training")
 
         scale_pos_weight = (y_train == 0).sum()/(y_train == 1).sum()
         print(f" Class Imbalance ratio: {scale_pos_weight:.2f} -- applied to positive class")
         print("building XGboost Model")
 
-        model = XGBClassifier(
-            n_estimators = 300,
-            learning_rate = 0.03,
-            max_depth = 7,
-            
-            subsample = 0.95,
-            colsample_bytree= 0.98,
-
-            n_jobs=-1,
-            random_state = 42,
-            eval_metric ="logloss",
-
-            scale_pos_weight= scale_pos_weight
-        )
+        model = XGBClassifier(**XGB_PARAMS, n_jobs=-1, scale_pos_weight=scale_pos_weight)
 
-        train_start = time.time()
-        model.fit(X_train, y_train)
-        train_time = time.time() - train_start
+        with profiler.stage("fit", rows=len(X_train)) as stage:
+            model.fit(X_train, y_train)
+        train_time = stage["wall_s"]
         mlflow.log_metric("train_time",train_time)
         print(f"model Trained in {train_time:.2f} seconds")
 
         print(" Evaluating the Model Performance ")
 
-        eval_time = time.time()
-        proba = model.predict_proba(X_test)[:,1]
-        y_pred = (proba >= args.threshold).astype(int)
-        pred_time = time.time()- eval_time
+        with profiler.stage("evaluate", rows=len(X_test)) as stage:
+            proba = model.predict_proba(X_test)[:,1]
+        pred_time = stage["wall_s"]
         mlflow.log_metric("pred_time", pred_time)
+        metrics = log_evaluation(y_test, proba, args.threshold)
 
-        precision = precision_score(y_test, y_pred)
-        recall = recall_score(y_test,y_pred)
-        f1 = f1_score(y_test,y_pred)
-        roc_auc = roc_auc_score(y_test,proba)
-
-        mlflow.log_metric("precision", precision)
-        mlflow.log_metric("recall", recall)
-        mlflow.log_metric("f1", f1)
-        mlflow.log_metric("roc_auc",roc_auc)
-
-        print(" Model Performance .. " )
-        print(f" precision : {precision} | recall :  {recall}")
-        print(f" F1 Score : {f1} | roc_auc { roc_auc}")
-
-        print(" Saving Model to Mlflow ")
-        mlflow.sklearn.log_model(
-            sk_model=model,
-            name="model"
+        finalize_model(
+            model, y_test, proba, df, target, artifacts_dir, profiler,
+            calibration=args.calibration,
+            cal_scores=lambda: model.predict_proba(X_cal)[:,1], y_cal=y_cal,
         )
-        print(" Model Saved to mlflow ")
 
-        print(f"   Performance Summary:")
-        print(f"   Training time: {train_time:.2f}s")
-        print(f"   Inference time: {pred_time:.4f}s")
-        print(f"   Samples per second: {len(X_test)/pred_time:.0f}")
-        
-        print(f" Detailed Classification Report:")
-        print(classification_report(y_test, y_pred, digits=3))
+        print_report(metrics, y_test, train_time, pred_time, profiler, artifacts_dir)
+        if profile_dir:
+            print(f" cProfile dumps saved to {profiler.profile_dir} (open with snakeviz or python -m pstats)")
 
 if __name__ == "__main__" :
     p = argparse.ArgumentParser(description= " Run Churn pipeline with XGBoost + Mlflow")
@@ -170,6 +141,12 @@ if __name__ == "__main__" :
     p.add_argument("--target", type=str, default="Churn")
     p.add_argument("--threshold", type=float, default=0.35)
     p.add_argument("--test_size", type=float, default=0.2)
+    p.add_argument("--calibration", type=str, default="isotonic", choices=["isotonic", "sigmoid", "none"],
+                   help=" Probability calibration fitted on a held-out slice of the training data ")
+    p.add_argument("--calibration_size", type=float, default=0.2,
+                   help=" Fraction of the training data held out for calibration ")
+    p.add_argument("--profile", action="store_true",
+                   help=" Also dump a cProfile .prof per stage to artifacts/profiles and log them to Mlflow ")
     p.add_argument("--experiment", type=str, default=" Telco Churn - XGBOOST")
     p.add_argument("--mlflow_uri", type=str, default=None,
                    help=" Override Mlflow tracking URI, else uses project_root/mlruns ")
@@ -0,0 +1,242 @@
+"""
+Distributed training on partitioned Parquet / CSV shards with Dask + xgboost.dask
+e.g: python scripts/run_pipeline_distributed.py --input data/raw/history/ --workers 1,2,4
+     python scripts/run_pipeline_distributed.py --input "data/raw/history/*.parquet" --scheduler_address tcp://10.0.0.5:8786
+"""
+import os
+import sys
+import glob
+import time
+import json
+import argparse
+import tempfile
+import pandas as pd
+import dask
+import dask.dataframe as dd
+import mlflow
+from dask.distributed import Client, LocalCluster, wait
+from xgboost import XGBClassifier
+from xgboost.dask import DaskXGBClassifier
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..")))
+
+from src.data.preprocess import preprocess_data
+from src.features.build_features import build_features, fit_vocabulary, merge_vocabularies
+from src.utils.validate_data import validate_telco_data
+from src.models.params import XGB_PARAMS
+from src.models.finalize import check_data_quality, save_feature_metadata, log_evaluation, finalize_model, print_report
+from src.utils.profiling import StageProfiler
+from src.utils.utils import setup_logger
+
+# Keep raw strings as object dtype so preprocess / build_features see the same frames as pandas
+dask.config.set({"dataframe.convert-string": False})
+
+def read_shards(path: str, blocksize: str = "64MB") -> dd.DataFrame:
+    """
+    Dask DataFrame over a shard folder or glob, Parquet if the shards are .parquet else CSV
+    """
+    if os.path.isdir(path):
+        pattern = os.path.join(path, "*.parquet")
+        path = pattern if glob.glob(pattern) else os.path.join(path, "*.csv")
+    if not glob.glob(path):
+        raise FileNotFoundError(f"No shards found : {path}")
+
+    if path.endswith(".parquet"):
+        return dd.read_parquet(path)
+    # TotalCharges holds blanks in the raw export, let preprocess_data coerce it
+    return dd.read_csv(path, blocksize=blocksize, dtype={"TotalCharges": "object", "customerID": "object"})
+
+def _validate_partition(df: pd.DataFrame) -> pd.DataFrame:
+    is_valid, failed = validate_telco_data(df)
+    return pd.DataFrame({"is_valid": [is_valid], "failed": [json.dumps(failed)]})
+
+def _model_frame(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    # Same column order on every partition, float32 like the serving matrix
+    return df.reindex(columns=columns, fill_value=0).astype("float32")
+
+def train(client: Client, X_train, y_train, scale_pos_weight: float):
+    # Same model as run_pipeline.py, threads come from the Dask workers
+    model = DaskXGBClassifier(**XGB_PARAMS, scale_pos_weight=scale_pos_weight)
+    model.client = client
+
+    start = time.time()
+    model.fit(X_train, y_train)
+    return model, time.time() - start
+
+def time_training(n_workers: int, args, X_train, y_train, scale_pos_weight: float) -> float:
+    """
+    Train the same model on a fresh LocalCluster with n_workers and return the fit time
+    """
+    with LocalCluster(n_workers=n_workers, threads_per_worker=args.threads_per_worker) as cluster, Client(cluster) as client:
+        X_train, y_train = client.persist([X_train, y_train])
+        wait([X_train, y_train])
+        _, seconds = train(client, X_train, y_train, scale_pos_weight)
+    return seconds
+
+def main(args):
+
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__),".."))
+    mlrun_path = args.mlflow_uri or '../mlruns'
+    mlflow.set_tracking_uri(mlrun_path)
+    mlflow.set_experiment(args.experiment)
+
+    log_dir = os.path.join(project_root, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    logger = setup_logger("run_pipeline_distributed", os.path.join(log_dir, "pipeline.log"))
+    profiler = StageProfiler(logger=logger)
+
+    worker_counts = sorted({int(n) for n in args.workers.split(",")})
+    target = args.target
+
+    if args.scheduler_address:
+        print(f" Connecting to Dask scheduler at {args.scheduler_address}")
+        cluster = None
+        client = Client(args.scheduler_address)
+    else:
+        print(f" Starting LocalCluster with {worker_counts[-1]} workers x {args.threads_per_worker} threads")
+        cluster = LocalCluster(n_workers=worker_counts[-1], threads_per_worker=args.threads_per_worker)
+        client = Client(cluster)
+    n_workers = len(client.scheduler_info()["workers"])
+
+    with mlflow.start_run():
+        logger.info(f"run_id={mlflow.active_run().info.run_id} input={args.input} workers={n_workers}")
+        mlflow.log_param("model","xgboost")
+        mlflow.log_param("mode", "dask")
+        mlflow.log_param("threshold", args.threshold)
+        mlflow.log_param("test_size", args.test_size)
+        mlflow.log_param("calibration", args.calibration)
+        mlflow.log_param("n_workers", n_workers)
+        mlflow.log_param("threads_per_worker", args.threads_per_worker)
+
+        # Stages time the lazy graphs where they are computed
+        with profiler.stage("load"):
+            print(" Loading Data ..")
+            ddf = read_shards(args.input, args.blocksize)
+            print(f" Data loaded : {ddf.npartitions} partitions, {len(ddf.columns)} columns")
+
+        with profiler.stage("validate"):
+            print(" Validating Data with Great Expectations (per partition)")
+            checks = client.compute(ddf.map_partitions(_validate_partition, meta={"is_valid": bool, "failed": object})).result()
+        check_data_quality(bool(checks["is_valid"].all()), sorted({f for fs in checks["failed"] for f in json.loads(fs)}))
+
+        print("Preprocessing data ..")
+        ddf = ddf.map_partitions(preprocess_data, target_col=target)
+        if target not in ddf.columns:
+            raise ValueError(f"Target Column {target} column  not found in the data")
+
+        # One pass over the shards for the category levels, shared by every partition
+        with profiler.stage("vocabulary"):
+            print(" Fitting shared vocabulary ..")
+            parts = [dask.delayed(fit_vocabulary)(p, target_col=target) for p in ddf.to_delayed()]
+            vocabulary = merge_vocabularies(client.compute(parts, sync=True))
+            print(f" Vocabulary covers {len(vocabulary)} categorical columns")
+
+        print(" Splitting Data")
+        # Random (not stratified) split, computed partition by partition
+        fractions = [1 - args.test_size, args.test_size]
+        if args.calibration != "none":
+            fractions = [(1 - args.test_size) * (1 - args.calibration_size), (1 - args.test_size) * args.calibration_size, args.test_size]
+        splits = ddf.random_split(fractions, random_state=41)
+        test_df = splits[-1]
+
+        print(" Building Features")
+        encoded = [s.map_partitions(build_features, target_col=target, vocabulary=vocabulary) for s in splits]
+        feature_cols = [c for c in encoded[0].columns if c != target]
+        print(f" Feature engineering completed : {len(feature_cols)} features")
+
+        artifacts_dir = args.artifacts_dir or os.path.join(project_root, "artifacts")
+        save_feature_metadata(feature_cols, target, artifacts_dir, vocabulary=vocabulary)
+
+        X_parts = [e.map_partitions(_model_frame, feature_cols) for e in encoded]
+        y_parts = [e[target].astype("int32") for e in encoded]
+        with profiler.stage("build_features") as stage:
+            X_train, y_train = client.persist([X_parts[0], y_parts[0]])
+            wait([X_train, y_train])
+            n_train = int(client.compute(y_train.size).result())
+            n_pos = int(client.compute(y_train.sum()).result())
+            stage["rows"] = n_train
+        print(f" Train : {n_train} samples on {n_workers} workers")
+
+        scale_pos_weight = (n_train - n_pos) / n_pos
+        print(f" Class Imbalance ratio: {scale_pos_weight:.2f} -- applied to positive class")
+        print("building XGboost Model (xgboost.dask)")
+
+        with profiler.stage("fit", rows=n_train):
+            model, train_time = train(client, X_train, y_train, scale_pos_weight)
+        mlflow.log_metric("train_time",train_time)
+        print(f"model Trained in {train_time:.2f} seconds")
+
+        # Scaling efficiency T(base) * base / (n * T(n)), each count on its own LocalCluster
+        if cluster is not None and len(worker_counts) > 1:
+            print(f" Measuring scaling over {worker_counts} workers ..")
+            times = {worker_counts[-1]: train_time}
+            for n in worker_counts[:-1]:
+                times[n] = time_training(n, args, X_parts[0], y_parts[0], scale_pos_weight)
+            base = worker_counts[0]
+            scaling = []
+            for n in worker_counts:
+                efficiency = times[base] * base / (n * times[n])
+                scaling.append({"workers": n, "train_time": times[n], "speedup": times[base] / times[n], "efficiency": efficiency})
+                mlflow.log_metric(f"train_time_{n}_workers", times[n])
+                mlflow.log_metric(f"scaling_efficiency_{n}_workers", efficiency)
+            mlflow.log_dict({"threads_per_worker": args.threads_per_worker, "runs": scaling}, "scaling_report.json")
+
+            print(f" {'workers':>8} {'train s':>9} {'speedup':>8} {'efficiency':>11}")
+            for r in scaling:
+                print(f" {r['workers']:>8} {r['train_time']:>9.2f} {r['speedup']:>8.2f} {r['efficiency']:>11.2f}")
+
+        print(" Evaluating the Model Performance ")
+
+        with profiler.stage("evaluate") as stage:
+            proba = model.predict_proba(X_parts[-1])[:, 1].compute()
+            y_test = y_parts[-1].compute().to_numpy()
+            stage["rows"] = len(y_test)
+        pred_time = stage["wall_s"]
+        mlflow.log_metric("pred_time", pred_time)
+        metrics = log_evaluation(y_test, proba, args.threshold)
+
+        # Plain XGBClassifier so the logged model serves exactly like the single-node one
+        with tempfile.TemporaryDirectory() as tmp:
+            model.save_model(os.path.join(tmp, "model.ubj"))
+            sk_model = XGBClassifier()
+            sk_model.load_model(os.path.join(tmp, "model.ubj"))
+
+        # Reference profile from the held-out split, the only rows collected on the driver
+        y_cal = y_parts[1].compute().to_numpy() if args.calibration != "none" else None
+        finalize_model(
+            sk_model, y_test, proba, test_df.compute(), target, artifacts_dir, profiler,
+            calibration=args.calibration,
+            cal_scores=lambda: model.predict_proba(X_parts[1])[:, 1].compute(), y_cal=y_cal,
+        )
+
+        print_report(metrics, y_test, train_time, pred_time, profiler, artifacts_dir, where=f" on {n_workers} workers")
+
+    client.close()
+    if cluster is not None:
+        cluster.close()
+
+if __name__ == "__main__" :
+    p = argparse.ArgumentParser(description= " Run Churn pipeline distributed with Dask + XGBoost + Mlflow")
+    p.add_argument("--input", type=str, required= True,
+                   help=" Shard folder or glob of Parquet / csv files e.g: data/raw/history/ ")
+    p.add_argument("--target", type=str, default="Churn")
+    p.add_argument("--threshold", type=float, default=0.35)
+    p.add_argument("--test_size", type=float, default=0.2)
+    p.add_argument("--calibration", type=str, default="isotonic", choices=["isotonic", "sigmoid", "none"],
+                   help=" Probability calibration fitted on a held-out slice of the training data ")
+    p.add_argument("--calibration_size", type=float, default=0.2,
+                   help=" Fraction of the training data held out for calibration ")
+    p.add_argument("--workers", type=str, default="1,2,4",
+                   help=" LocalCluster worker counts; trains on the largest and times the others for scaling efficiency ")
+    p.add_argument("--threads_per_worker", type=int, default=1)
+    p.add_argument("--scheduler_address", type=str, default=None,
+                   help=" Existing Dask scheduler (multi-node), skips the LocalCluster and scaling runs ")
+    p.add_argument("--blocksize", type=str, default="64MB",
+                   help=" Partition size when reading csv shards ")
+    p.add_argument("--experiment", type=str, default=" Telco Churn - XGBOOST")
+    p.add_argument("--mlflow_uri", type=str, default=None,
+                   help=" Override Mlflow tracking URI, else uses project_root/mlruns ")
+    p.add_argument("--artifacts_dir", type=str, default=None,
+                   help=" Where feature metadata, calibrator, profile and trees are written, else project_root/artifacts ")
+    args = p.parse_args()
+    main(args)
@@ -0,0 +1,89 @@
+"""
+Checks of the vectorized batch validator and of encode_columns against the
+get_dummies + reindex transform it replaced.
+e.g: python scripts/test_batch_validation.py
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from utils.schema import ALLOWED_VALUES, validate_columns
+from serving.inference import BINARY_MAP, NUMERIC_COLS, FEATURE_COLS, encode_columns
+
+def make_columns(n: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    columns = {f: rng.choice(levels, n).tolist() for f, levels in ALLOWED_VALUES.items()}
+    columns["SeniorCitizen"] = rng.integers(0, 2, n).tolist()
+    columns["tenure"] = rng.integers(0, 73, n).tolist()
+    columns["MonthlyCharges"] = rng.uniform(18, 120, n).round(2).tolist()
+    columns["TotalCharges"] = rng.uniform(0, 8000, n).round(2).tolist()
+    return columns
+
+def reference_transform(df: pd.DataFrame) -> pd.DataFrame:
+    # The per-record transform used before encode_columns
+    df = df.copy()
+    for c in NUMERIC_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0)
+    for c, mapping in BINARY_MAP.items():
+        if c in df.columns:
+            df[c] = df[c].astype(str).str.strip().map(mapping).astype("Int64").fillna(0).astype(int)
+    obj_cols = df.select_dtypes(include=["object"]).columns.tolist()
+    if obj_cols:
+        df = pd.get_dummies(df, columns=obj_cols, drop_first=False)
+    bool_cols = df.select_dtypes(include=["bool"]).columns
+    if len(bool_cols) > 0:
+        df[bool_cols] = df[bool_cols].astype(int)
+    return df.reindex(columns=FEATURE_COLS, fill_value=0)
+
+def raises(columns: dict, fragment: str) -> bool:
+    try:
+        validate_columns(columns)
+    except ValueError as e:
+        return fragment in str(e)
+    return False
+
+print(" Batch validation checks ")
+
+columns = make_columns(500, seed=1)
+valid, errors = validate_columns(columns)
+assert valid.all() and not errors, " Clean batch flagged"
+
+# Row errors: unknown level, out of range, missing required value, non-integer flag
+bad = {f: list(v) for f, v in columns.items()}
+bad["Contract"][3] = "Weekly"
+bad["tenure"][7] = 500
+bad["MonthlyCharges"][11] = None
+bad["SeniorCitizen"][13] = 0.5
+valid, errors = validate_columns(bad)
+assert sorted(np.flatnonzero(~valid).tolist()) == [3, 7, 11, 13], " Wrong invalid rows"
+assert {(e["row"], e["field"]) for e in errors} == {(3, "Contract"), (7, "tenure"), (11, "MonthlyCharges"), (13, "SeniorCitizen")}, " Wrong error fields"
+_, errors = validate_columns(bad, max_errors=2)
+assert len(errors) == 2, " max_errors not applied"
+
+# Malformed payloads are ValueErrors (422), never TypeErrors (500)
+assert raises({f: v for f, v in columns.items() if f != "tenure"}, "Missing fields"), " Missing field accepted"
+assert raises({**columns, "tenure": 5}, "Field tenure must be an array"), " Scalar field accepted"
+assert raises({**columns, "gender": "Male"}, "Field gender must be an array"), " Scalar string field accepted"
+assert raises({**columns, "tenure": [[1, 2]] * 500}, "Field tenure must be a flat array"), " Nested numeric field accepted"
+assert raises({**columns, "gender": [["Male"]] * 500}, "Field gender must be a flat array"), " Nested categorical field accepted"
+assert raises({**columns, "tenure": columns["tenure"][:-1]}, "same length"), " Ragged columns accepted"
+
+# Typed arrays (Arrow / msgpack decoders) validate like plain lists
+typed = {f: pd.Categorical(v) if f in ALLOWED_VALUES else np.asarray(v) for f, v in bad.items()}
+typed["MonthlyCharges"] = np.asarray(bad["MonthlyCharges"], dtype=float)
+valid_typed, _ = validate_columns(typed)
+assert (valid_typed == validate_columns(bad)[0]).all(), " Typed arrays validate differently"
+
+# encode_columns matches the get_dummies path, including unknown levels and bad numbers
+columns = make_columns(2000, seed=2)
+columns["InternetService"][0] = "Satellite"
+columns["TotalCharges"][1] = " "
+expected = reference_transform(pd.DataFrame(columns)).to_numpy(dtype=np.float32)
+assert np.array_equal(encode_columns(columns), expected), " encode_columns differs from get_dummies"
+assert np.array_equal(encode_columns({f: v[:1] for f, v in columns.items()}), expected[:1]), " Single row differs"
+
+print(" Batch validation checks passed ")
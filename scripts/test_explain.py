@@ -0,0 +1,68 @@
+"""
+Checks of the TreeSHAP churn drivers: source-field roll-up, additivity against
+the booster margin, top-N clamping, the LRU cache and the bulk csv writer.
+e.g: python scripts/test_explain.py
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from utils.schema import ALLOWED_VALUES, NUMERIC_RANGES
+from serving.inference import FEATURE_COLS, _serve_transform
+from serving.explain import SOURCE_FIELDS, booster, explain, explain_file, _contributions, _cached_contributions
+
+def make_customers(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f: rng.choice(levels, n) for f, levels in ALLOWED_VALUES.items()})
+    df.insert(0, "customerID", [f"C{i:04d}" for i in range(n)])
+    df["SeniorCitizen"] = rng.integers(0, 2, n)
+    df["tenure"] = rng.integers(0, 73, n)
+    df["MonthlyCharges"] = rng.uniform(18, 120, n).round(2)
+    df["TotalCharges"] = (df["tenure"] * df["MonthlyCharges"]).round(2)
+    return df
+
+print(" Churn driver explanation checks ")
+
+# Every driver is a real input field or an engineered column kept whole
+fields = set(ALLOWED_VALUES) | set(NUMERIC_RANGES)
+assert "No" not in SOURCE_FIELDS, " Engineered column split into a made-up field"
+assert all(f in fields or f in FEATURE_COLS for f in SOURCE_FIELDS), " Unknown source field"
+assert {"InternetService", "PaymentMethod", "tenure"} <= set(SOURCE_FIELDS), " Input field lost in the roll-up"
+
+# Rolled-up contributions plus the bias add up to the booster margin
+df = make_customers(300, seed=1)
+X = _serve_transform(df).to_numpy(dtype=np.float32)
+contribs = _contributions(X)
+margin = booster.predict(xgb.DMatrix(X, feature_names=FEATURE_COLS), output_margin=True)
+assert np.allclose(contribs.sum(axis=1), margin, atol=1e-4), " Contributions do not add up to the margin"
+
+# Top-N: sorted by |contribution|, clamped to [1, number of source fields]
+record = df.drop(columns=["customerID"]).iloc[0].to_dict()
+drivers = explain(record, top_n=5)["drivers"]
+assert len(drivers) == 5, " top_n not applied"
+assert [abs(d["contribution"]) for d in drivers] == sorted((abs(d["contribution"]) for d in drivers), reverse=True), " Drivers not sorted"
+assert len(explain(record, top_n=-3)["drivers"]) == 1, " Negative top_n not clamped"
+assert len(explain(record, top_n=100)["drivers"]) == len(SOURCE_FIELDS), " Large top_n not clamped"
+full = explain(record, top_n=100)
+assert abs(sum(d["contribution"] for d in full["drivers"]) + full["base_value"] - margin[0]) < 1e-4, " Single row not additive"
+
+# Identical encoded rows hit the cache
+hits = _cached_contributions.cache_info().hits
+explain(record)
+assert _cached_contributions.cache_info().hits > hits, " Repeated customer missed the cache"
+
+# The bulk writer picks the same drivers as the single-customer path, across chunks
+with tempfile.TemporaryDirectory() as tmp:
+    df.to_csv(os.path.join(tmp, "customers.csv"), index=False)
+    assert explain_file(os.path.join(tmp, "customers.csv"), os.path.join(tmp, "drivers.csv"), top_n=3, chunksize=128) == len(df), " Bulk count"
+    out = pd.read_csv(os.path.join(tmp, "drivers.csv"))
+for i in (0, 150, 299):
+    single = explain(df.drop(columns=["customerID"]).iloc[i].to_dict(), top_n=3)["drivers"]
+    assert [d["feature"] for d in single] == [out.loc[i, f"driver_{j}"] for j in (1, 2, 3)], " Bulk drivers differ"
+
+print(" Churn driver explanation checks passed ")
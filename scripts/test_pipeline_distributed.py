@@ -0,0 +1,85 @@
+"""
+Smoke test of the Dask pipeline: generated csv shards, a 1 / 2 worker LocalCluster,
+MLflow in a temporary file store and artifacts in a temporary folder.
+e.g: python scripts/test_pipeline_distributed.py
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.schema import ALLOWED_VALUES
+from src.data.preprocess import preprocess_data
+from src.features.build_features import build_features
+from src.serving.tree_predictor import TreeEnsemblePredictor
+from run_pipeline_distributed import main
+
+def make_shard(n: int, seed: int, contracts: list) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f: rng.choice(levels, n) for f, levels in ALLOWED_VALUES.items()})
+    df["Contract"] = rng.choice(contracts, n)
+    df.insert(0, "customerID", [f"S{seed}-{i:05d}" for i in range(n)])
+    df["SeniorCitizen"] = rng.integers(0, 2, n)
+    df["tenure"] = rng.integers(0, 73, n)
+    df["MonthlyCharges"] = rng.uniform(18, 120, n).round(2)
+    # Blank TotalCharges like the raw export
+    df["TotalCharges"] = (df["tenure"] * df["MonthlyCharges"]).round(2).astype(str)
+    df.loc[df["tenure"] == 0, "TotalCharges"] = " "
+    risk = (df["Contract"] == "Month-to-month") * 0.4 + (df["tenure"] < 12) * 0.3
+    df["Churn"] = np.where(rng.random(n) < risk, "Yes", "No")
+    return df
+
+# Dask worker processes import this module, keep the run under the main guard
+if __name__ == "__main__":
+    print(" Distributed pipeline smoke test ")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shard_dir = os.path.join(tmp, "shards")
+        artifacts_dir = os.path.join(tmp, "artifacts")
+        os.makedirs(shard_dir)
+
+        # The first shard has no two-year contracts, the shared vocabulary must still encode them
+        shards = [make_shard(600, 0, ["Month-to-month", "One year"])]
+        shards += [make_shard(600, seed, ALLOWED_VALUES["Contract"]) for seed in range(1, 4)]
+        for i, shard in enumerate(shards):
+            shard.to_csv(os.path.join(shard_dir, f"part-{i}.csv"), index=False)
+
+        main(argparse.Namespace(
+            input=shard_dir, target="Churn", threshold=0.35, test_size=0.2,
+            calibration="isotonic", calibration_size=0.2, workers="1,2", threads_per_worker=1,
+            scheduler_address=None, blocksize="64MB", experiment="smoke test",
+            mlflow_uri="file://" + os.path.join(tmp, "mlruns"), artifacts_dir=artifacts_dir,
+        ))
+
+        # Same artifact set as run_pipeline.py
+        for name in ("feature_columns.json", "feature_columns.txt", "preprocessing.pkl", "calibrator.pkl",
+                     "reference_profile.json", "trees.npz", "stage_profile.json"):
+            assert os.path.exists(os.path.join(artifacts_dir, name)), f" Missing artifact {name}"
+
+        # Same feature columns as encoding all shards at once with pandas
+        full = preprocess_data(pd.concat(shards, ignore_index=True))
+        expected_cols = [c for c in build_features(full).columns if c != "Churn"]
+        with open(os.path.join(artifacts_dir, "feature_columns.json")) as f:
+            feature_cols = json.load(f)
+        assert feature_cols == expected_cols, " Shared vocabulary differs from the single-frame encoding"
+
+        # Calibrator, profile and exported trees all belong to the logged model
+        predictor = TreeEnsemblePredictor.load(os.path.join(artifacts_dir, "trees.npz"))
+        calibrator = joblib.load(os.path.join(artifacts_dir, "calibrator.pkl"))
+        with open(os.path.join(artifacts_dir, "reference_profile.json")) as f:
+            profile = json.load(f)
+        assert predictor.model_version and calibrator["model_version"] == predictor.model_version, " Calibrator not tied to the model"
+        assert profile["model_version"] == predictor.model_version, " Reference profile not tied to the model"
+
+        X = build_features(full).reindex(columns=feature_cols, fill_value=0).to_numpy(dtype=np.float32)
+        proba = predictor.predict_proba(X)[:, 1]
+        assert ((proba >= 0) & (proba <= 1)).all(), " Probabilities out of range"
+
+    print(" Distributed pipeline smoke test passed ")
@@ -0,0 +1,54 @@
+"""
+Prediction log checks: the buffer drop policy, row accounting and reading the
+SQLite files back with read_prediction_logs.
+e.g: python scripts/test_prediction_log.py
+"""
+import os
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from monitoring.prediction_log import PredictionLogger, read_prediction_logs
+
+def make_batch(n: int, start: int = 0) -> pd.DataFrame:
+    return pd.DataFrame({"tenure": range(start, start + n), "Contract": ["One year"] * n})
+
+print(" Prediction log checks ")
+
+with tempfile.TemporaryDirectory() as tmp:
+    # A long flush interval keeps the writer thread idle, so the buffer is inspected as filled
+    logger = PredictionLogger(tmp, max_buffer=10, batch_size=4, flush_interval=3600)
+
+    # Batches are queued as chunks of batch_size rows: 4 + 4 + 2
+    logger.log_batch(make_batch(10), [0.1] * 10, ["No"] * 10, "m", latency_ms=10.0)
+    assert logger.stats() == {"buffered": 10, "written": 0, "dropped": 0}, f" Row accounting {logger.stats()}"
+
+    # A full buffer drops the oldest chunk to fit a new row
+    logger.log({"tenure": 99, "Contract": "Two year"}, 0.9, "Yes", "m", latency_ms=2.5)
+    assert logger.stats() == {"buffered": 7, "written": 0, "dropped": 4}, f" Oldest chunk not dropped {logger.stats()}"
+
+    # An entry larger than the whole buffer is dropped itself, the buffer is kept
+    logger.max_buffer = 3
+    logger._append(("ts", "m", make_batch(5), [0.5] * 5, ["No"] * 5, 1.0), 5)
+    assert logger.stats() == {"buffered": 7, "written": 0, "dropped": 9}, f" Oversized entry evicted the buffer {logger.stats()}"
+    logger.max_buffer = 10
+
+    logger.close()
+    assert logger.stats() == {"buffered": 0, "written": 7, "dropped": 9}, f" Close did not flush {logger.stats()}"
+
+    # Written rows come back with the features expanded, in logging order
+    logs = read_prediction_logs(tmp)
+    assert len(logs) == 7, " Written row count"
+    assert logs["tenure"].tolist() == [4, 5, 6, 7, 8, 9, 99], " Wrong rows kept"
+    assert logs["label"].tolist() == ["No"] * 6 + ["Yes"], " Labels"
+    assert logs["latency_ms"].iloc[0] == 1.0 and logs["latency_ms"].iloc[-1] == 2.5, " Per-row batch latency"
+    assert {"ts", "model_version", "probability", "Contract"} <= set(logs.columns), " Missing columns"
+    assert "features" not in logs.columns, " Features not expanded"
+    assert len(read_prediction_logs(tmp, since=logs["ts"].max() + 1)) == 0, " since filter"
+
+with tempfile.TemporaryDirectory() as tmp:
+    assert read_prediction_logs(tmp).columns.tolist() == ["ts", "model_version", "features", "probability", "label", "latency_ms"], " Empty log columns"
+
+print(" Prediction log checks passed ")
@@ -0,0 +1,87 @@
+"""
+StageProfiler checks: per-stage metrics, the saved table, the per-run cProfile
+dumps and the ru_maxrss fallback when psutil is not installed.
+e.g: python scripts/test_profiling.py
+"""
+import os
+import sys
+import json
+import time
+import pstats
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from utils import profiling
+from utils.profiling import StageProfiler
+
+def hold_memory(mb: int):
+    # Touched pages, held long enough for the RSS sampler to see them
+    block = np.ones(mb * 2**20 // 8)
+    time.sleep(0.1)
+    return block.sum()
+
+print(" Stage profiler checks ")
+
+with tempfile.TemporaryDirectory() as tmp:
+    profiler = StageProfiler(profile_dir=tmp)
+    with profiler.stage("load", rows=1000):
+        hold_memory(100)
+    with profiler.stage("fit") as record:
+        sum(i * i for i in range(200000))
+        record["rows"] = 500
+
+    # One record per stage, rows set inside the block count too
+    assert [r["stage"] for r in profiler.stages] == ["load", "fit"], " Stage order"
+    for r in profiler.stages:
+        assert r["wall_s"] > 0 and r["cpu_s"] >= 0, f" {r['stage']} timings"
+        assert abs(r["rows_per_s"] - r["rows"] / r["wall_s"]) < 1e-6, f" {r['stage']} rows/sec"
+    assert profiler.stages[0]["peak_rss_delta_mb"] > 50, " RSS sampler missed the load stage peak"
+
+    metrics = profiler.metrics()
+    expected = {f"stage_{s}_{k}" for s in ("load", "fit") for k in ("wall_s", "cpu_s", "peak_rss_delta_mb", "rows_per_s")}
+    assert set(metrics) == expected | {"stage_total_wall_s"}, f" Metric names {sorted(metrics)}"
+    assert abs(metrics["stage_total_wall_s"] - metrics["stage_load_wall_s"] - metrics["stage_fit_wall_s"]) < 1e-9, " Total wall time"
+    assert "load" in profiler.summary() and "fit" in profiler.summary(), " Summary table"
+
+    # Saved table round-trips
+    profiler.save(os.path.join(tmp, "stage_profile.json"))
+    with open(os.path.join(tmp, "stage_profile.json")) as f:
+        assert json.load(f) == {"stages": profiler.stages}, " Saved table differs"
+
+    # One numbered .prof per stage in this run's folder, readable by pstats
+    run_dir = profiler.profile_dir
+    assert os.path.dirname(run_dir) == tmp and os.path.basename(run_dir).startswith("run-"), f" Run folder {run_dir}"
+    assert [r["profile"] for r in profiler.stages] == [os.path.join(run_dir, "00_load.prof"), os.path.join(run_dir, "01_fit.prof")], " Dump paths"
+    for r in profiler.stages:
+        assert pstats.Stats(r["profile"]).total_calls > 0, f" Empty dump {r['profile']}"
+
+    # A second run started in the same second gets its own folder
+    second = StageProfiler(profile_dir=tmp)
+    with second.stage("load"):
+        pass
+    assert second.profile_dir != run_dir, " Runs share a dump folder"
+    assert sorted(os.listdir(run_dir)) == ["00_load.prof", "01_fit.prof"], " Earlier run dumps changed"
+
+# Without profile_dir nothing is dumped
+plain = StageProfiler()
+with plain.stage("load"):
+    pass
+assert plain.profile_dir is None and "profile" not in plain.stages[0], " Dumped without profile_dir"
+
+# Without psutil the peak comes from the process high-water mark (ru_maxrss), no sampler thread
+original = profiling.psutil
+profiling.psutil = None
+try:
+    fallback = StageProfiler()
+    with fallback.stage("build_features", rows=10):
+        assert not any(isinstance(t, profiling._RssSampler) for t in profiling.threading.enumerate()), " Sampler started without psutil"
+        hold_memory(300)
+    r = fallback.stages[0]
+    assert r["peak_rss_delta_mb"] > 100, f" ru_maxrss fallback missed the peak {r['peak_rss_delta_mb']}"
+    assert "stage_build_features_peak_rss_delta_mb" in fallback.metrics(), " Fallback metric"
+finally:
+    profiling.psutil = original
+
+print(" Stage profiler checks passed ")
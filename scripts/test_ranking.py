@@ -0,0 +1,89 @@
+"""
+Calibration and top-K ranking checks on a generated customer file.
+e.g: python scripts/test_ranking.py
+"""
+import os
+import sys
+import tempfile
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from utils.schema import ALLOWED_VALUES
+from models.calibrate import fit_calibrator, apply_calibrator
+from serving import inference
+from serving.inference import MODEL_VERSION, load_calibrator, decision_threshold, raw_scores_batch, predict_with_proba
+from serving.ranking import rank_top_k
+
+def make_customers(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f: rng.choice(levels, n) for f, levels in ALLOWED_VALUES.items()})
+    df.insert(0, "customerID", [f"C{i:04d}" for i in range(n)])
+    df["SeniorCitizen"] = rng.integers(0, 2, n)
+    df["tenure"] = rng.integers(0, 73, n)
+    df["MonthlyCharges"] = rng.uniform(18, 120, n).round(2)
+    df["TotalCharges"] = (df["tenure"] * df["MonthlyCharges"]).round(2)
+    return df
+
+print(" Calibration and ranking checks ")
+
+# Calibrators: monotone, in [0, 1], and no calibrator returns the raw scores
+rng = np.random.default_rng(0)
+scores = rng.random(5000)
+y = (rng.random(5000) < scores * 0.6).astype(int)
+grid = np.linspace(0, 1, 101)
+for method in ("isotonic", "sigmoid"):
+    calibrated = apply_calibrator(fit_calibrator(scores, y, method=method), grid)
+    assert ((calibrated >= 0) & (calibrated <= 1)).all(), f" {method} out of [0, 1]"
+    assert (np.diff(calibrated) >= -1e-12).all(), f" {method} not monotone"
+assert np.array_equal(apply_calibrator(None, grid), grid), " Missing calibrator changed the scores"
+assert decision_threshold(None) == 0.5, " Raw threshold must be 0.5"
+
+# Only a calibrator fitted for the served model is used
+calibrator = fit_calibrator(scores, y, method="isotonic")
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "calibrator.pkl")
+    joblib.dump({**calibrator, "model_version": "another-model"}, path)
+    assert load_calibrator(path, MODEL_VERSION) is None, " Calibrator of another model used"
+    joblib.dump({**calibrator, "model_version": MODEL_VERSION}, path)
+    assert load_calibrator(path, MODEL_VERSION)["method"] == "isotonic", " Matching calibrator ignored"
+assert load_calibrator(None, MODEL_VERSION) is None, " Missing calibrator"
+
+df = make_customers(250, seed=1)
+records = df.drop(columns=["customerID"]).to_dict(orient="records")
+raw = raw_scores_batch(df)
+
+original = (inference.CALIBRATOR, inference.DECISION_THRESHOLD)
+inference.CALIBRATOR = {**calibrator, "model_version": MODEL_VERSION}
+inference.DECISION_THRESHOLD = decision_threshold(inference.CALIBRATOR)
+try:
+    # The label agrees with the returned probability, also where isotonic ties raw scores
+    out = [predict_with_proba(r) for r in records]
+    likely = {o["churn_probability"] for o in out if o["prediction"] == "Likely to Churn"}
+    unlikely = {o["churn_probability"] for o in out if o["prediction"] != "Likely to Churn"}
+    assert not likely & unlikely, " Same probability with both labels"
+    assert all((o["prediction"] == "Likely to Churn") == (o["churn_probability"] > inference.DECISION_THRESHOLD) for o in out), " Label disagrees with the probability"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "customers.csv")
+        df.to_csv(path, index=False)
+
+        # Top-K across chunk boundaries is the full sort on the raw score
+        expected = df["customerID"].to_numpy()[np.argsort(-raw, kind="stable")]
+        ranked = rank_top_k(path, k=40, chunksize=64)
+        assert [r["customerID"] for r in ranked] == expected[:40].tolist(), " Top-K differs from the full sort"
+        assert [r["rank"] for r in ranked] == list(range(1, 41)), " Ranks not consecutive"
+        proba = [r["churn_probability"] for r in ranked]
+        assert proba == sorted(proba, reverse=True), " Calibrated probabilities out of order"
+        assert abs(proba[0] - float(apply_calibrator(inference.CALIBRATOR, raw.max()))) < 1e-9, " Ranked probability not calibrated"
+
+        # k larger than the file returns every customer once
+        ranked = rank_top_k(path, k=1000, chunksize=64)
+        assert [r["customerID"] for r in ranked] == expected.tolist(), " k > rows must return everyone"
+        assert rank_top_k(path, k=40, chunksize=1000) == rank_top_k(path, k=40, chunksize=7)[:40], " Chunk size changed the ranking"
+finally:
+    inference.CALIBRATOR, inference.DECISION_THRESHOLD = original
+
+print(" Calibration and ranking checks passed ")
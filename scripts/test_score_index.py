@@ -0,0 +1,87 @@
+"""
+Build / refresh / lookup checks for the precomputed score index on a generated customer file.
+e.g: python scripts/test_score_index.py
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from utils.schema import ALLOWED_VALUES
+from serving import score_index
+from serving.score_index import ScoreIndex, build_score_index, refresh_score_index
+from serving.inference import predict_proba_batch
+
+def make_customers(ids, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    n = len(ids)
+    df = pd.DataFrame({f: rng.choice(levels, n) for f, levels in ALLOWED_VALUES.items()})
+    df.insert(0, "customerID", ids)
+    df["SeniorCitizen"] = rng.integers(0, 2, n)
+    df["tenure"] = rng.integers(0, 73, n)
+    df["MonthlyCharges"] = rng.uniform(18, 120, n).round(2)
+    df["TotalCharges"] = (df["tenure"] * df["MonthlyCharges"]).round(2)
+    return df
+
+print(" Score index build / refresh / lookup ")
+
+with tempfile.TemporaryDirectory() as tmp:
+    index_dir = os.path.join(tmp, "index")
+    base = make_customers([f"C{i:04d}" for i in range(200)], seed=1)
+    base.to_csv(os.path.join(tmp, "base.csv"), index=False)
+
+    assert build_score_index(os.path.join(tmp, "base.csv"), index_dir) == 200, " Build count"
+
+    index = ScoreIndex(index_dir, reload_interval=0)
+    expected = predict_proba_batch(base)
+    hit = index.lookup("C0040")
+    assert hit is not None and abs(hit["churn_probability"] - expected[40]) < 1e-6, " Lookup score"
+    assert index.lookup("C9999") is None, " Unknown id must miss"
+    assert index.lookup("X" * 100) is None, " Over-long id must miss"
+
+    # Refresh right after the build (same second, same process) with 5 changed and 2 new customers
+    changed = make_customers([f"C{i:04d}" for i in range(5)] + ["C0200", "C0201"], seed=2)
+    changed.to_csv(os.path.join(tmp, "changed.csv"), index=False)
+    assert refresh_score_index(os.path.join(tmp, "changed.csv"), index_dir) == 202, " Refresh count"
+    refreshed = predict_proba_batch(changed)
+    assert abs(index.lookup("C0001")["churn_probability"] - refreshed[1]) < 1e-6, " Changed customer not rescored"
+    assert abs(index.lookup("C0201")["churn_probability"] - refreshed[6]) < 1e-6, " New customer missing"
+    assert abs(index.lookup("C0040")["churn_probability"] - expected[40]) < 1e-6, " Unchanged customer altered"
+
+    # A refresh file without rows leaves the index as it is
+    changed.head(0).to_csv(os.path.join(tmp, "empty.csv"), index=False)
+    assert refresh_score_index(os.path.join(tmp, "empty.csv"), index_dir) == 202, " Empty refresh"
+
+    # New model version: unchanged customers must be rescored, not relabeled
+    original = (score_index.MODEL_VERSION, score_index.predict_encoded)
+    score_index.MODEL_VERSION = "test-model"
+    score_index.predict_encoded = lambda X: {
+        "prediction": np.full(len(X), "Likely to Churn", dtype=object),
+        "churn_probability": np.full(len(X), 0.99),
+    }
+    try:
+        refresh_score_index(os.path.join(tmp, "changed.csv"), index_dir)
+        hit = index.lookup("C0040")
+        assert hit["model_version"] == "test-model", " Model version not updated"
+        assert abs(hit["churn_probability"] - 0.99) < 1e-6, " Old score stamped with the new model version"
+        assert hit["prediction"] == "Likely to Churn", " Old label kept after a model change"
+    finally:
+        score_index.MODEL_VERSION, score_index.predict_encoded = original
+
+    # Non-ASCII ids are stored and looked up as UTF-8
+    accented = make_customers(["Zoë-1", "Jürgen-2", "李-3"], seed=3)
+    accented.to_csv(os.path.join(tmp, "accented.csv"), index=False)
+    refresh_score_index(os.path.join(tmp, "accented.csv"), index_dir)
+    accented_proba = predict_proba_batch(accented)
+    for i, customer_id in enumerate(accented["customerID"]):
+        hit = index.lookup(customer_id)
+        assert hit is not None and abs(hit["churn_probability"] - accented_proba[i]) < 1e-6, f" Lookup of {customer_id}"
+    assert index.lookup("Zoe-1") is None, " Non-ASCII id matched its ASCII lookalike"
+
+    versions = [d for d in os.listdir(index_dir) if d.startswith("v")]
+    assert len(versions) == 2, " Only the two newest versions are kept"
+
+print(" Score index checks passed ")
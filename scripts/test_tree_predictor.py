@@ -0,0 +1,92 @@
+"""
+Parity check of the numpy tree predictor against XGBoost on the deployed model.
+Random inputs include 2% missing values to exercise the default directions.
+e.g: python scripts/test_tree_predictor.py
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+import xgboost as xgb
+from xgboost import XGBClassifier
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),"..","src")))
+
+from models.export_trees import export_booster
+from serving.tree_predictor import TreeEnsemblePredictor
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "app", "models", "m-e2655f75ee9a490ab154aef6b4cfbe19", "artifacts")
+# XGBoost accumulates leaf values in float32, so allow float32 rounding relative to the margin
+TOLERANCE = 1e-5
+
+def _max_rel_diff(actual, expected) -> float:
+    return float(np.max(np.abs(actual - expected) / np.maximum(np.abs(expected), 1.0)))
+
+print(" Tree predictor parity vs XGBoost ")
+
+model = XGBClassifier()
+model.load_model(os.path.join(MODEL_DIR, "model.ubj"))
+booster = model.get_booster()
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "trees.npz")
+    arrays = export_booster(booster, path)
+    predictor = TreeEnsemblePredictor.load(path)
+
+assert predictor.feature_names == booster.feature_names, " Feature names differ"
+
+rng = np.random.default_rng(7)
+n = 20000
+X = rng.random((n, len(predictor.feature_names)), dtype=np.float32)
+# Scale to the raw numeric ranges, one-hot columns stay in [0, 1]
+for i, name in enumerate(predictor.feature_names):
+    if name == "tenure":
+        X[:, i] *= 72
+    elif name == "MonthlyCharges":
+        X[:, i] = 18 + X[:, i] * 102
+    elif name == "TotalCharges":
+        X[:, i] *= 8700
+    else:
+        X[:, i] = X[:, i] > 0.5
+X[rng.random(X.shape) < 0.02] = np.nan
+
+dm = xgb.DMatrix(X, feature_names=booster.feature_names)
+expected_margin = booster.predict(dm, output_margin=True)
+expected_proba = booster.predict(dm)
+
+margin = predictor.predict_margin(X)
+proba = predictor.predict_proba(X)
+
+margin_diff = _max_rel_diff(margin, expected_margin)
+proba_diff = float(np.max(np.abs(proba[:, 1] - expected_proba)))
+print(f" rows : {n} | max relative margin diff : {margin_diff:.2e} | max proba diff : {proba_diff:.2e}")
+
+assert margin_diff < TOLERANCE, " Margin mismatch"
+assert proba_diff < TOLERANCE, " Probability mismatch"
+assert np.allclose(proba.sum(axis=1), 1.0), " predict_proba rows must sum to 1"
+
+# Single rows and odd block boundaries go through the same path
+assert _max_rel_diff(predictor.predict_margin(X[0]), expected_margin[:1]) < TOLERANCE, " Single row mismatch"
+predictor.block_rows = 333
+assert _max_rel_diff(predictor.predict_margin(X), expected_margin) < TOLERANCE, " Block boundary mismatch"
+
+# Trees deeper than the padding cap walk the node table instead
+pointer = TreeEnsemblePredictor(arrays, max_padded_depth=2)
+assert pointer.deep is not None, " Deep trees were padded"
+assert _max_rel_diff(pointer.predict_margin(X), expected_margin) < TOLERANCE, " Pointer walk mismatch"
+
+# Unbounded lossguide trees and binary:logitraw (probability is still the sigmoid of the margin)
+Xs = X[:5000, :8]
+ys = (np.nan_to_num(Xs[:, 0]) + rng.random(len(Xs)) > 0.8).astype(int)
+for params in ({"objective": "binary:logistic", "grow_policy": "lossguide", "max_depth": 0, "max_leaves": 256, "min_child_weight": 0},
+               {"objective": "binary:logitraw", "max_depth": 4}):
+    small = xgb.train({**params, "tree_method": "hist"}, xgb.DMatrix(Xs, ys), num_boost_round=20)
+    with tempfile.TemporaryDirectory() as tmp:
+        export_booster(small, os.path.join(tmp, "trees.npz"))
+        small_predictor = TreeEnsemblePredictor.load(os.path.join(tmp, "trees.npz"))
+    small_margin = small.predict(xgb.DMatrix(Xs), output_margin=True)
+    assert _max_rel_diff(small_predictor.predict_margin(Xs), small_margin) < TOLERANCE, f" {params['objective']} margin mismatch"
+    small_proba = small_predictor.predict_proba(Xs)[:, 1]
+    assert np.max(np.abs(small_proba - 1.0 / (1.0 + np.exp(-small_margin)))) < TOLERANCE, f" {params['objective']} probability mismatch"
+
+print(" Tree predictor matches XGBoost ")
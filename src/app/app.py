@@ -1,56 +1,274 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-import gradio as gr
+from fastapi import FastAPI, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from typing import Literal
+import numpy as np
+import pandas as pd
 import os
 import sys
+import time
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__),'..')))
 
-from serving.inference import predict
+from serving.inference import (
+    predict, predict_with_proba, predict_columns, predict_encoded,
+    _artifact_path, MODEL_VERSION, FEATURE_COLS, PROJECT_ARTIFACTS_DIR,
+)
+from serving.score_index import ScoreIndex
+from serving.wire import NotAcceptable, UnsupportedMediaType, decode_columns, encode_result, negotiate
+from serving.ranking import rank_top_k
+try:
+    from serving.explain import explain as explain_customer
+except ImportError:
+    # Dependency-light serving (SERVING_BACKEND=numpy) ships without xgboost
+    explain_customer = None
+try:
+    import gradio as gr
+except ImportError:
+    # The slim serving image ships without the Gradio UI
+    gr = None
+from monitoring.drift import DriftMonitor, load_profile
+from monitoring.prediction_log import PredictionLogger
+from utils.schema import ALLOWED_VALUES, NUMERIC_RANGES, validate_columns
 
 app = FastAPI()
 
+# Serving-side histograms compared against the training reference profile
+profile_file = _artifact_path("reference_profile.json")
+drift_monitor = DriftMonitor(load_profile(profile_file), model_version=MODEL_VERSION) if profile_file else None
+
+# Background prediction log, set PREDICTION_LOG_DIR="" to disable
+PREDICTION_LOG_DIR = os.getenv(
+    "PREDICTION_LOG_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "logs", "predictions"))
+)
+prediction_logger = PredictionLogger(PREDICTION_LOG_DIR) if PREDICTION_LOG_DIR else None
+
+# Precomputed scores written by scripts/build_score_index.py
+SCORE_INDEX_DIR = os.getenv("SCORE_INDEX_DIR", str(PROJECT_ARTIFACTS_DIR / "score_index"))
+score_index = ScoreIndex(SCORE_INDEX_DIR)
+
+@app.on_event("shutdown")
+def flush_prediction_log():
+    if prediction_logger:
+        prediction_logger.close()
+
 @app.get("/")
 def root():
     return {"status": "ok"}
 
 class CustomerData(BaseModel):
-    gender: str
-    Partner: str
-    Dependents: str
-    PhoneService: str
-    MultipleLines: str
-    InternetService: str
-    OnlineSecurity: str
-    OnlineBackup: str
-    DeviceProtection: str
-    TechSupport: str
-    StreamingTV: str
-    StreamingMovies: str
-    Contract: str
-    PaperlessBilling: str
-    PaymentMethod: str
-    tenure: int
-    MonthlyCharges: float
-    TotalCharges: float
+    gender: Literal[tuple(ALLOWED_VALUES["gender"])]
+    SeniorCitizen: int = Field(0, ge=NUMERIC_RANGES["SeniorCitizen"][0], le=NUMERIC_RANGES["SeniorCitizen"][1])
+    Partner: Literal[tuple(ALLOWED_VALUES["Partner"])]
+    Dependents: Literal[tuple(ALLOWED_VALUES["Dependents"])]
+    PhoneService: Literal[tuple(ALLOWED_VALUES["PhoneService"])]
+    MultipleLines: Literal[tuple(ALLOWED_VALUES["MultipleLines"])]
+    InternetService: Literal[tuple(ALLOWED_VALUES["InternetService"])]
+    OnlineSecurity: Literal[tuple(ALLOWED_VALUES["OnlineSecurity"])]
+    OnlineBackup: Literal[tuple(ALLOWED_VALUES["OnlineBackup"])]
+    DeviceProtection: Literal[tuple(ALLOWED_VALUES["DeviceProtection"])]
+    TechSupport: Literal[tuple(ALLOWED_VALUES["TechSupport"])]
+    StreamingTV: Literal[tuple(ALLOWED_VALUES["StreamingTV"])]
+    StreamingMovies: Literal[tuple(ALLOWED_VALUES["StreamingMovies"])]
+    Contract: Literal[tuple(ALLOWED_VALUES["Contract"])]
+    PaperlessBilling: Literal[tuple(ALLOWED_VALUES["PaperlessBilling"])]
+    PaymentMethod: Literal[tuple(ALLOWED_VALUES["PaymentMethod"])]
+    tenure: int = Field(..., ge=NUMERIC_RANGES["tenure"][0], le=NUMERIC_RANGES["tenure"][1])
+    MonthlyCharges: float = Field(..., ge=NUMERIC_RANGES["MonthlyCharges"][0], le=NUMERIC_RANGES["MonthlyCharges"][1])
+    TotalCharges: float = Field(..., ge=NUMERIC_RANGES["TotalCharges"][0])
 
 @app.post("/predict")
-def api_predict(data: CustomerData):
+def api_predict(data: CustomerData, explain: bool = False, top_n: int = Query(5, ge=1)):
     try:
-        out = predict(data.dict())
-        return {"prediction": out}
+        start = time.perf_counter()
+        out = predict_with_proba(data.dict())
+        latency_ms = (time.perf_counter() - start) * 1000
+        if drift_monitor:
+            drift_monitor.update_record(data.dict(), out["churn_probability"])
+        if prediction_logger:
+            prediction_logger.log(data.dict(), out["churn_probability"], out["prediction"], MODEL_VERSION, latency_ms)
+        if explain and explain_customer is None:
+            out["explanation"] = {"error": "Explanations are not available with this serving backend"}
+        elif explain:
+            out["explanation"] = explain_customer(data.dict(), top_n=top_n)
+        return out
     except Exception as e :
         return {"error" : str(e)}
 
+MAX_BATCH_ROWS = 100000
+
+def _predict_batch(columns: dict) -> dict:
+    """
+    Validate a column-oriented batch with vectorized checks and score the
+    valid rows; invalid rows get null outputs and per-row errors.
+    """
+    # Reject oversized batches before any per-value work, the length of one column is
+    # enough; malformed payloads (scalars, ragged columns) are left to validate_columns
+    first = next(iter(columns.values()), None)
+    if hasattr(first, "__len__") and not isinstance(first, (str, bytes)) and len(first) > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch too large : {len(first)} rows, max {MAX_BATCH_ROWS}")
+
+    try:
+        valid, errors = validate_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    n = len(valid)
+
+    idx = np.flatnonzero(valid)
+    fields = list(ALLOWED_VALUES) + list(NUMERIC_RANGES)
+    if len(idx) == n:
+        valid_columns = {f: columns[f] for f in fields}
+    else:
+        valid_columns = {}
+        for f in fields:
+            values = columns[f]
+            if not isinstance(values, (np.ndarray, pd.Categorical)):
+                values = np.asarray(values)
+            valid_columns[f] = values[idx]
+
+    prediction = np.full(n, None, dtype=object)
+    churn_probability = np.full(n, np.nan)
+    if len(idx):
+        start = time.perf_counter()
+        out = predict_columns(valid_columns)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        prediction[idx] = out["prediction"]
+        churn_probability[idx] = out["churn_probability"]
+
+        if drift_monitor or prediction_logger:
+            frame = pd.DataFrame(valid_columns)
+            if drift_monitor:
+                drift_monitor.update(frame, out["churn_probability"])
+            if prediction_logger:
+                prediction_logger.log_batch(frame, out["churn_probability"], out["prediction"], MODEL_VERSION, latency_ms)
+
+    return {
+        "n_rows": n,
+        "n_valid": int(len(idx)),
+        "prediction": prediction,
+        "churn_probability": churn_probability,
+        "errors": errors,
+    }
+
+@app.post("/predict/batch")
+async def api_predict_batch(request: Request):
+    """
+    Column-oriented batch scoring, one array per field:
+    {"columns": {"gender": ["Male", ...], "tenure": [5, ...], ...}}
+
+    Content-Type / Accept select the wire format: application/json (default),
+    application/msgpack or application/vnd.apache.arrow.stream (record batches).
+    Accept q-values are honoured; 406 when no accepted format can be served.
+    """
+    body = await request.body()
+    try:
+        media_type = negotiate(request.headers.get("accept"))
+        columns = decode_columns(body, request.headers.get("content-type"))
+    except NotAcceptable as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Could not decode batch : {e}")
+
+    result = await run_in_threadpool(_predict_batch, columns)
+    return Response(content=encode_result(result, media_type), media_type=media_type)
+
+@app.post("/rank")
+def api_rank(file: UploadFile = File(...), k: int = 50000, chunksize: int = 50000):
+    """
+    Upload a customer csv and get back the top-K customers by churn probability
+    """
+    if k <= 0 or chunksize <= 0:
+        raise HTTPException(status_code=422, detail="k and chunksize must be positive")
+    try:
+        ranked = rank_top_k(file.file, k=k, chunksize=chunksize)
+        return {"k": k, "customers": ranked}
+    except Exception as e :
+        return {"error" : str(e)}
+
+def _index_response(hit: dict) -> dict:
+    return {
+        "customerID": hit["customerID"],
+        "prediction": hit["prediction"],
+        "churn_probability": hit["churn_probability"],
+        "model_version": hit["model_version"],
+        "source": "index",
+    }
+
+@app.get("/score/{customer_id}")
+def api_score(customer_id: str):
+    """
+    Precomputed score for a known customer. If the index was built with an
+    older model, the stored features are rescored live with the current one.
+    """
+    hit = score_index.lookup(customer_id)
+    if hit is None:
+        raise HTTPException(status_code=404, detail="Unknown customerID, POST the customer record to /score/{customerID} or /predict")
+
+    if hit["model_version"] == MODEL_VERSION:
+        return _index_response(hit)
+
+    if hit["feature_columns"] != FEATURE_COLS:
+        raise HTTPException(status_code=409, detail="Index is stale and its features do not match the current model, POST the customer record")
+
+    out = predict_encoded(hit["features"])
+    return {
+        "customerID": customer_id,
+        "prediction": out["prediction"][0],
+        "churn_probability": float(out["churn_probability"][0]),
+        "model_version": MODEL_VERSION,
+        "source": "live",
+    }
+
+@app.post("/score/{customer_id}")
+def api_score_with_record(customer_id: str, data: CustomerData):
+    """
+    Served from the index when the customer is known and the score is current,
+    otherwise scored live from the posted record.
+    """
+    hit = score_index.lookup(customer_id)
+    if hit is not None and hit["model_version"] == MODEL_VERSION:
+        return _index_response(hit)
+
+    out = predict_with_proba(data.dict())
+    return {"customerID": customer_id, **out, "model_version": MODEL_VERSION, "source": "live"}
+
+@app.get("/drift")
+def api_drift():
+    """
+    PSI / KS per feature and for the score, for traffic since startup (or last reset)
+    """
+    if drift_monitor is None:
+        raise HTTPException(status_code=404, detail="No reference_profile.json found, retrain with run_pipeline.py")
+    return drift_monitor.report()
+
+@app.post("/drift/reset")
+def api_drift_reset():
+    if drift_monitor is None:
+        raise HTTPException(status_code=404, detail="No reference_profile.json found, retrain with run_pipeline.py")
+    drift_monitor.reset()
+    return {"status": "ok"}
+
+@app.get("/prediction_log")
+def api_prediction_log():
+    if prediction_logger is None:
+        return {"enabled": False}
+    return {"enabled": True, "log_dir": PREDICTION_LOG_DIR, **prediction_logger.stats()}
+
 # Gradio UI
 def gradio_interface(
-      gender, Partner, Dependents, PhoneService, MultipleLines,
+      gender, SeniorCitizen, Partner, Dependents, PhoneService, MultipleLines,
     InternetService, OnlineSecurity, OnlineBackup, DeviceProtection,
     TechSupport, StreamingTV, StreamingMovies, Contract,
     PaperlessBilling, PaymentMethod, tenure, MonthlyCharges, TotalCharges      
 ):
     payload = {
         "gender": gender,
+        "SeniorCitizen": int(SeniorCitizen),
         "Partner": Partner,
         "Dependents": Dependents,
         "PhoneService": PhoneService,
@@ -72,35 +290,37 @@ def gradio_interface(
     out = predict(payload)
     return str(out)
 
-demo = gr.Interface(
-    fn=gradio_interface,
-        inputs=[
-        gr.Dropdown(["Male", "Female"], label="Gender"),
-        gr.Dropdown(["Yes", "No"], label="Partner"),
-        gr.Dropdown(["Yes", "No"], label="Dependents"),
-        gr.Dropdown(["Yes", "No"], label="Phone Service"),
-        gr.Dropdown(["Yes", "No", "No phone service"], label="Multiple Lines"),
-        gr.Dropdown(["DSL", "Fiber optic", "No"], label="Internet Service"),
-        gr.Dropdown(["Yes", "No", "No internet service"], label="Online Security"),
-        gr.Dropdown(["Yes", "No", "No internet service"], label="Online Backup"),
-        gr.Dropdown(["Yes", "No", "No internet service"], label="Device Protection"),
-        gr.Dropdown(["Yes", "No", "No internet service"], label="Tech Support"),
-        gr.Dropdown(["Yes", "No", "No internet service"], label="Streaming TV"),
-        gr.Dropdown(["Yes", "No", "No internet service"], label="Streaming Movies"),
-        gr.Dropdown(["Month-to-month", "One year", "Two year"], label="Contract"),
-        gr.Dropdown(["Yes", "No"], label="Paperless Billing"),
-        gr.Dropdown(
-            ["Electronic check", "Mailed check",
-             "Bank transfer (automatic)", "Credit card (automatic)"],
-            label="Payment Method"
-        ),
-        gr.Number(label="Tenure (months)"),
-        gr.Number(label="Monthly Charges"),
-        gr.Number(label="Total Charges"),
-    ],
-    outputs="text",
-    title="Telco Churn Predictor",
-    description="Fill in the customer details to get a churn prediction.",
-)
+if gr is not None:
+    demo = gr.Interface(
+        fn=gradio_interface,
+            inputs=[
+            gr.Dropdown(["Male", "Female"], label="Gender"),
+            gr.Dropdown([0, 1], value=0, label="Senior Citizen"),
+            gr.Dropdown(["Yes", "No"], label="Partner"),
+            gr.Dropdown(["Yes", "No"], label="Dependents"),
+            gr.Dropdown(["Yes", "No"], label="Phone Service"),
+            gr.Dropdown(["Yes", "No", "No phone service"], label="Multiple Lines"),
+            gr.Dropdown(["DSL", "Fiber optic", "No"], label="Internet Service"),
+            gr.Dropdown(["Yes", "No", "No internet service"], label="Online Security"),
+            gr.Dropdown(["Yes", "No", "No internet service"], label="Online Backup"),
+            gr.Dropdown(["Yes", "No", "No internet service"], label="Device Protection"),
+            gr.Dropdown(["Yes", "No", "No internet service"], label="Tech Support"),
+            gr.Dropdown(["Yes", "No", "No internet service"], label="Streaming TV"),
+            gr.Dropdown(["Yes", "No", "No internet service"], label="Streaming Movies"),
+            gr.Dropdown(["Month-to-month", "One year", "Two year"], label="Contract"),
+            gr.Dropdown(["Yes", "No"], label="Paperless Billing"),
+            gr.Dropdown(
+                ["Electronic check", "Mailed check",
+                 "Bank transfer (automatic)", "Credit card (automatic)"],
+                label="Payment Method"
+            ),
+            gr.Number(label="Tenure (months)"),
+            gr.Number(label="Monthly Charges"),
+            gr.Number(label="Total Charges"),
+        ],
+        outputs="text",
+        title="Telco Churn Predictor",
+        description="Fill in the customer details to get a churn prediction.",
+    )
 
-app = gr.mount_gradio_app(app, demo, path="/ui")
+    app = gr.mount_gradio_app(app, demo, path="/ui")
@@ -1,13 +1,13 @@
 import pandas as pd
 
-def _map_binary_series(s:pd.DataFrame) -> pd.Series :
+def _map_binary_series(s:pd.DataFrame, levels: list = None) -> pd.Series :
     """
     apply binary encoding for the 2-category features
 
     """
 
-    # Get Unique value and remove NaN
-    vals = list(pd.Series(s.dropna().unique().astype(str)))
+    # Get Unique value and remove NaN (or take them from a shared vocabulary)
+    vals = list(levels) if levels is not None else list(pd.Series(s.dropna().unique().astype(str)))
     valset = set(vals)
 
     # Yes/No mapping 1/0
@@ -27,18 +27,47 @@ def _map_binary_series(s:pd.DataFrame) -> pd.Series :
     
     return s
 
-def build_features(df: pd.DataFrame, target_col: str ="Churn")-> pd.DataFrame:
+def fit_vocabulary(df: pd.DataFrame, target_col: str = "Churn") -> dict:
+    """
+    Sorted levels of every categorical column, {column: [levels]}
+    """
+    obj_cols = [c for c in df.select_dtypes(include=["object"]).columns if c != target_col]
+    return {c: sorted(df[c].dropna().astype(str).unique().tolist()) for c in obj_cols}
+
+def merge_vocabularies(vocabularies) -> dict:
+    """
+    Union of per-partition vocabularies, so every shard encodes the same columns
+    """
+    merged = {}
+    for vocabulary in vocabularies:
+        for c, levels in vocabulary.items():
+            merged.setdefault(c, set()).update(levels)
+    return {c: sorted(levels) for c, levels in merged.items()}
+
+def build_features(df: pd.DataFrame, target_col: str ="Churn", vocabulary: dict = None)-> pd.DataFrame:
+    """
+    Binary / one-hot encode the categorical columns.
+
+    Without a vocabulary the levels come from df itself. Pass the vocabulary
+    fitted on the full data set when encoding partitions separately, so
+    every partition gets the same mappings and one-hot columns.
+    """
 
     df = df.copy()
     print(f" Starting features engineering on {df.shape[1]} columns ..")
 
-    obj_cols = [c for c in df.select_dtypes(include=["object"]).columns if c != target_col]
+    if vocabulary is not None:
+        obj_cols = [c for c in vocabulary if c in df.columns and c != target_col]
+        n_levels = {c: len(vocabulary[c]) for c in obj_cols}
+    else:
+        obj_cols = [c for c in df.select_dtypes(include=["object"]).columns if c != target_col]
+        n_levels = {c: df[c].dropna().nunique() for c in obj_cols}
     numeric_cols = df.select_dtypes(include=["int64","float64"]).columns.tolist()
 
     print(f" Found {len(obj_cols)} categorical and {len(numeric_cols)} numeric columns")
 
-    binary_cols = [c for c in obj_cols if df[c].dropna().nunique() == 2]
-    multi_cols = [c for c in obj_cols if df[c].dropna().nunique() > 2 ]
+    binary_cols = [c for c in obj_cols if n_levels[c] == 2]
+    multi_cols = [c for c in obj_cols if n_levels[c] > 2 ]
 
     print(f"Binary features : {len(binary_cols)} | Multi-category features : {len(multi_cols)}")
     if binary_cols:
@@ -48,7 +77,8 @@ def build_features(df: pd.DataFrame, target_col: str ="Churn")-> pd.DataFrame:
 
     for c in binary_cols :
         original_dtpye = df[c].dtype
-        df[c] = _map_binary_series(df[c].astype(str))
+        levels = vocabulary[c] if vocabulary is not None else None
+        df[c] = _map_binary_series(df[c].astype(str), levels)
         print(f"{c}:{original_dtpye}-> binary (0/1)")
 
     bool_cols = df.select_dtypes(include=["bool"]).columns.tolist()
@@ -60,6 +90,11 @@ def build_features(df: pd.DataFrame, target_col: str ="Churn")-> pd.DataFrame:
         print(f" Applying one-hot encoding to {len(multi_cols)} multi-category columns ...")
         original_shape = df.shape
 
+        if vocabulary is not None:
+            # Fixed categories: levels missing from this partition still get their column
+            for c in multi_cols:
+                df[c] = pd.Categorical(df[c], categories=vocabulary[c])
+
         df = pd.get_dummies(df, columns= multi_cols, drop_first = True)
 
         new_features = df.shape[1] - original_shape[1]+ len(multi_cols)
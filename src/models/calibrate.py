@@ -0,0 +1,61 @@
+import numpy as np
+
+CALIBRATION_METHODS = ("isotonic", "sigmoid")
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(np.asarray(p, dtype=float), 1e-6, 1 - 1e-6)
+    return np.log(p / (1 - p))
+
+def fit_calibrator(scores: np.ndarray, y: np.ndarray, method: str = "isotonic") -> dict:
+    """
+    Fit a probability calibrator on held-out raw model scores.
+
+    The calibrator is returned as a plain dict of numbers so it can be
+    pickled next to the model and applied at serving time with numpy only.
+    """
+    scores = np.asarray(scores, dtype=float)
+    y = np.asarray(y, dtype=int)
+
+    # Only needed at training time, serving applies the dict with numpy
+    from sklearn.isotonic import IsotonicRegression
+    from sklearn.linear_model import LogisticRegression
+
+    if method == "isotonic":
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip")
+        iso.fit(scores, y)
+        return {
+            "method": "isotonic",
+            "x": iso.X_thresholds_.tolist(),
+            "y": iso.y_thresholds_.tolist(),
+        }
+
+    if method == "sigmoid":
+        # Platt scaling on the logit of the raw score
+        lr = LogisticRegression(C=1e6)
+        lr.fit(_logit(scores).reshape(-1, 1), y)
+        return {
+            "method": "sigmoid",
+            "a": float(lr.coef_[0][0]),
+            "b": float(lr.intercept_[0]),
+        }
+
+    raise ValueError(f"Unknown calibration method : {method}. Use one of {CALIBRATION_METHODS}")
+
+def apply_calibrator(calibrator: dict, scores: np.ndarray) -> np.ndarray:
+    """
+    Map raw model scores to calibrated churn probabilities.
+    A missing calibrator returns the raw scores unchanged.
+    """
+    scores = np.asarray(scores, dtype=float)
+
+    if not calibrator:
+        return scores
+
+    if calibrator["method"] == "isotonic":
+        return np.interp(scores, calibrator["x"], calibrator["y"])
+
+    if calibrator["method"] == "sigmoid":
+        z = calibrator["a"] * _logit(scores) + calibrator["b"]
+        return 1.0 / (1.0 + np.exp(-z))
+
+    raise ValueError(f"Unknown calibration method : {calibrator['method']}")
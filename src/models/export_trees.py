@@ -0,0 +1,90 @@
+import json
+import numpy as np
+
+SUPPORTED_OBJECTIVES = ("binary:logistic", "binary:logitraw")
+
+def _parse_base_score(value) -> float:
+    # XGBoost >= 3 stores it as a vector string like "[5E-1]"
+    return float(str(value).strip("[]").split(",")[0])
+
+def flatten_booster(booster) -> dict:
+    """
+    Flatten a trained binary XGBoost booster into flat numpy arrays.
+
+    All trees share one node table: feature index, float32 threshold,
+    global left/right child pointers, default direction for missing values
+    and leaf value. Leaves point to themselves so a fixed number of steps
+    (the maximum depth) walks every tree to its leaf.
+    """
+    model = json.loads(booster.save_raw("json"))
+    learner = model["learner"]
+    objective = learner["objective"]["name"]
+    if objective not in SUPPORTED_OBJECTIVES:
+        raise ValueError(f"Unsupported objective {objective}, expected one of {SUPPORTED_OBJECTIVES}")
+
+    gbm = learner["gradient_booster"]
+    if gbm["name"] != "gbtree":
+        raise ValueError(f"Only gbtree boosters can be exported, got {gbm['name']}")
+
+    features, thresholds, lefts, rights, default_left, values, roots = [], [], [], [], [], [], []
+    max_depth = 0
+    offset = 0
+
+    for tree in gbm["model"]["trees"]:
+        if any(tree["split_type"]):
+            raise ValueError("Categorical splits are not supported by the array predictor")
+
+        left = np.asarray(tree["left_children"], dtype=np.int64)
+        right = np.asarray(tree["right_children"], dtype=np.int64)
+        cond = np.asarray(tree["split_conditions"], dtype=np.float32)
+        n = len(left)
+        node_ids = np.arange(n)
+        leaf = left == -1
+
+        # Leaves loop back to themselves; their split_conditions hold the leaf value
+        features.append(np.where(leaf, 0, np.asarray(tree["split_indices"], dtype=np.int64)))
+        thresholds.append(np.where(leaf, 0.0, cond).astype(np.float32))
+        lefts.append(np.where(leaf, node_ids, left) + offset)
+        rights.append(np.where(leaf, node_ids, right) + offset)
+        default_left.append(np.asarray(tree["default_left"], dtype=bool) & ~leaf)
+        values.append(np.where(leaf, cond, 0.0).astype(np.float32))
+        roots.append(offset)
+
+        # Depth of every node from the parent pointers (parents come before children)
+        parents = np.asarray(tree["parents"], dtype=np.int64)
+        depth = np.zeros(n, dtype=np.int64)
+        for i in range(1, n):
+            depth[i] = depth[parents[i]] + 1
+        max_depth = max(max_depth, int(depth.max()))
+
+        offset += n
+
+    base_score = _parse_base_score(learner["learner_model_param"]["base_score"])
+    if objective == "binary:logistic":
+        base_margin = float(np.log(base_score / (1 - base_score)))
+    else:
+        base_margin = base_score
+
+    return {
+        "feature": np.concatenate(features).astype(np.int32),
+        "threshold": np.concatenate(thresholds),
+        "left": np.concatenate(lefts).astype(np.int32),
+        "right": np.concatenate(rights).astype(np.int32),
+        "default_left": np.concatenate(default_left),
+        "value": np.concatenate(values),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "max_depth": np.int32(max_depth),
+        "base_margin": np.float32(base_margin),
+        "objective": np.asarray(objective),
+        "feature_names": np.asarray(booster.feature_names or [], dtype=str),
+    }
+
+def export_booster(booster, path: str, model_version: str = None) -> dict:
+    """
+    Write the flattened ensemble to a compressed .npz that the numpy serving
+    backend (serving/tree_predictor.py) can load without xgboost installed.
+    """
+    arrays = flatten_booster(booster)
+    arrays["model_version"] = np.asarray(model_version or "")
+    np.savez_compressed(path, **arrays)
+    return arrays
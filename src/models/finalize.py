@@ -0,0 +1,129 @@
+import os
+import json
+import joblib
+import mlflow
+import mlflow.sklearn
+from sklearn.metrics import classification_report, precision_score, recall_score, f1_score, roc_auc_score, brier_score_loss
+
+from src.models.calibrate import fit_calibrator, apply_calibrator
+from src.models.export_trees import export_booster
+from src.monitoring.drift import build_reference_profile, save_profile
+
+# Steps shared by run_pipeline.py and run_pipeline_distributed.py around the
+# model fit, so both pipelines log and save exactly the same artifacts.
+
+def check_data_quality(is_valid: bool, failed: list):
+    mlflow.log_metric("data_quality_pass", int(is_valid))
+
+    if not is_valid:
+        mlflow.log_text(json.dumps(failed, indent=2), artifact_file="failed_expectations.json")
+        raise ValueError(f"Data Quality check failed. issue : {failed}")
+    print(" Data Validation Passed .. Logged to Mlflow ..")
+
+def save_feature_metadata(feature_cols: list, target: str, artifacts_dir: str, vocabulary: dict = None):
+    """
+    Feature columns (json + txt) and the preprocessing artifact, saved locally
+    for deployment and logged to MLflow for serving consistency
+    """
+    os.makedirs(artifacts_dir, exist_ok=True)
+
+    with open(os.path.join(artifacts_dir, "feature_columns.json"), "w") as f:
+        json.dump(feature_cols, f)
+    with open(os.path.join(artifacts_dir, "feature_columns.txt"), "w") as f:
+        f.write("\n".join(feature_cols))
+    mlflow.log_text("\n".join(feature_cols), artifact_file="feature_columns.txt")
+
+    preprocessing_artifact = {"feature_columns": feature_cols, "target": target}
+    if vocabulary is not None:
+        preprocessing_artifact["vocabulary"] = vocabulary
+        mlflow.log_dict(vocabulary, "vocabulary.json")
+    joblib.dump(preprocessing_artifact, os.path.join(artifacts_dir, "preprocessing.pkl"))
+    mlflow.log_artifact(os.path.join(artifacts_dir, "preprocessing.pkl"))
+    print(f" Saved {len(feature_cols)} feature columns for serving consistency")
+
+def log_evaluation(y_test, proba, threshold: float) -> dict:
+    """
+    Precision / recall / F1 at the decision threshold and ROC AUC, logged to MLflow
+    """
+    y_pred = (proba >= threshold).astype(int)
+    metrics = {
+        "precision": precision_score(y_test, y_pred),
+        "recall": recall_score(y_test, y_pred),
+        "f1": f1_score(y_test, y_pred),
+        "roc_auc": roc_auc_score(y_test, proba),
+    }
+    mlflow.log_metrics(metrics)
+    metrics["y_pred"] = y_pred
+    return metrics
+
+def finalize_model(model, y_test, proba, df_profile, target: str, artifacts_dir: str, profiler,
+                   calibration: str = "none", cal_scores=None, y_cal=None):
+    """
+    Log the model, then fit the calibrator, build the drift reference profile
+    and export the tree arrays, all tied to the logged model version.
+
+    model is a fitted XGBClassifier, proba its raw test scores. cal_scores is
+    a callable returning the raw scores of the calibration rows (y_cal), so
+    the scoring runs inside the calibrate stage. Returns the MLflow model info.
+    """
+    with profiler.stage("log_model"):
+        print(" Saving Model to Mlflow ")
+        model_info = mlflow.sklearn.log_model(sk_model=model, name="model")
+        print(" Model Saved to mlflow ")
+
+    # Calibrator and reference profile are tied to this model, serving ignores them for any other
+    if calibration != "none":
+        with profiler.stage("calibrate", rows=len(y_cal)):
+            print(f" Fitting {calibration} calibrator ..")
+            calibrator = fit_calibrator(cal_scores(), y_cal, method=calibration)
+            calibrator["model_version"] = model_info.model_uuid
+            calibrated = apply_calibrator(calibrator, proba)
+
+            mlflow.log_metric("brier_raw", brier_score_loss(y_test, proba))
+            mlflow.log_metric("brier_calibrated", brier_score_loss(y_test, calibrated))
+
+            # Stored next to the model so serving returns calibrated probabilities
+            joblib.dump(calibrator, os.path.join(artifacts_dir, "calibrator.pkl"))
+            mlflow.log_artifact(os.path.join(artifacts_dir, "calibrator.pkl"))
+            print(f" Brier score raw : {brier_score_loss(y_test, proba):.4f} | calibrated : {brier_score_loss(y_test, calibrated):.4f}")
+    else:
+        calibrated = proba
+
+    # Reference distribution for drift monitoring at serving time
+    with profiler.stage("reference_profile", rows=len(df_profile)):
+        print(" Building reference profile for drift monitoring ..")
+        profile = build_reference_profile(df_profile, scores=calibrated, target_col=target, model_version=model_info.model_uuid)
+        save_profile(profile, os.path.join(artifacts_dir, "reference_profile.json"))
+        mlflow.log_artifact(os.path.join(artifacts_dir, "reference_profile.json"))
+        print(f" Profiled {len(profile['numeric'])} numeric and {len(profile['categorical'])} categorical features")
+
+    # Flat tree arrays for the numpy serving backend (no xgboost / mlflow needed)
+    with profiler.stage("export_trees"):
+        trees_path = os.path.join(artifacts_dir, "trees.npz")
+        trees = export_booster(model.get_booster(), trees_path, model_version=model_info.model_uuid)
+        mlflow.log_artifact(trees_path)
+        print(f" Exported {len(trees['roots'])} trees ({len(trees['left'])} nodes) to {trees_path}")
+
+    return model_info
+
+def print_report(metrics: dict, y_test, train_time: float, pred_time: float, profiler, artifacts_dir: str, where: str = ""):
+    """
+    Performance summary, classification report and the stage profile table,
+    which is also logged to MLflow and saved next to the other artifacts
+    """
+    print(" Model Performance .. ")
+    print(f" precision : {metrics['precision']} | recall :  {metrics['recall']}")
+    print(f" F1 Score : {metrics['f1']} | roc_auc {metrics['roc_auc']}")
+
+    print(f"   Performance Summary:")
+    print(f"   Training time: {train_time:.2f}s{where}")
+    print(f"   Inference time: {pred_time:.4f}s")
+    print(f"   Samples per second: {len(y_test)/pred_time:.0f}")
+
+    print(f" Detailed Classification Report:")
+    print(classification_report(y_test, metrics["y_pred"], digits=3))
+
+    print(" Stage Profile:")
+    print(profiler.summary())
+    profiler.log_to_mlflow(mlflow)
+    profiler.save(os.path.join(artifacts_dir, "stage_profile.json"))
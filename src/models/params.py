@@ -0,0 +1,12 @@
+# XGBoost hyper-parameters shared by run_pipeline.py and run_pipeline_distributed.py,
+# so the single-node and Dask models stay the same. Threads (n_jobs) and
+# scale_pos_weight are set by each pipeline.
+XGB_PARAMS = {
+    "n_estimators": 300,
+    "learning_rate": 0.03,
+    "max_depth": 7,
+    "subsample": 0.95,
+    "colsample_bytree": 0.98,
+    "random_state": 42,
+    "eval_metric": "logloss",
+}
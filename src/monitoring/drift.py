@@ -0,0 +1,177 @@
+import json
+import threading
+import numpy as np
+import pandas as pd
+
+OTHER = "__other__"
+SCORE_EDGES = np.linspace(0, 1, 11)[1:-1]
+
+def _numeric(values) -> np.ndarray:
+    # Missing and unparsable values count as 0, as in preprocess_data and the
+    # serving encoder, so raw files and the preprocessed training frame agree
+    values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+    return np.nan_to_num(values, nan=0.0)
+
+def _bin_counts(values: np.ndarray, edges) -> np.ndarray:
+    idx = np.searchsorted(np.asarray(edges, dtype=float), values, side="right")
+    return np.bincount(idx, minlength=len(edges) + 1)
+
+def build_reference_profile(df: pd.DataFrame, scores=None, target_col: str = "Churn", n_bins: int = 10, model_version: str = None) -> dict:
+    """
+    Compact training distribution profile: quantile bin edges and counts for numeric
+    features, level frequencies for categorical features and the score histogram.
+    The score histogram is only comparable for the model in `model_version`.
+    """
+    profile = {"numeric": {}, "categorical": {}, "n_rows": int(len(df)), "model_version": model_version}
+
+    features = df.drop(columns=[target_col], errors="ignore")
+    numeric_cols = features.select_dtypes(include=["number"]).columns.tolist()
+    categorical_cols = features.select_dtypes(include=["object"]).columns.tolist()
+
+    for c in numeric_cols:
+        values = _numeric(features[c])
+        qs = np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]) if len(values) else []
+        edges = np.unique(qs).tolist()
+        profile["numeric"][c] = {"edges": edges, "counts": _bin_counts(values, edges).tolist()}
+
+    for c in categorical_cols:
+        counts = features[c].astype(str).str.strip().value_counts()
+        profile["categorical"][c] = {"levels": counts.index.tolist() + [OTHER], "counts": counts.tolist() + [0]}
+
+    if scores is not None:
+        profile["score"] = {"edges": SCORE_EDGES.tolist(), "counts": _bin_counts(np.asarray(scores, dtype=float), SCORE_EDGES).tolist()}
+
+    return profile
+
+def save_profile(profile: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(profile, f)
+
+def load_profile(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+def psi(expected, actual, eps: float = 1e-4) -> float:
+    """
+    Population Stability Index between two histograms over the same bins
+    """
+    e = np.asarray(expected, dtype=float)
+    a = np.asarray(actual, dtype=float)
+    if a.sum() == 0 or e.sum() == 0:
+        return 0.0
+    e = np.clip(e / e.sum(), eps, None)
+    a = np.clip(a / a.sum(), eps, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+def ks(expected, actual) -> float:
+    """
+    Kolmogorov-Smirnov statistic on binned counts (max gap between the two CDFs)
+    """
+    e = np.asarray(expected, dtype=float)
+    a = np.asarray(actual, dtype=float)
+    if a.sum() == 0 or e.sum() == 0:
+        return 0.0
+    return float(np.max(np.abs(np.cumsum(e) / e.sum() - np.cumsum(a) / a.sum())))
+
+def _status(value: float) -> str:
+    if value < 0.1:
+        return "stable"
+    if value < 0.25:
+        return "moderate"
+    return "significant"
+
+class DriftMonitor:
+    """
+    Incrementally maintains the same histograms as the reference profile.
+
+    Memory is fixed by the profile (one count per bin / level per feature),
+    raw requests are never stored. Scores are only compared when
+    `model_version` matches the model the profile was built with.
+    """
+
+    def __init__(self, profile: dict, model_version: str = None):
+        self.profile = profile
+        self.model_version = model_version
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.n_rows = 0
+            self.numeric = {c: np.zeros(len(p["counts"]), dtype=np.int64) for c, p in self.profile["numeric"].items()}
+            self.edges = {c: np.asarray(p["edges"], dtype=float) for c, p in self.profile["numeric"].items()}
+            self.categorical = {c: np.zeros(len(p["levels"]), dtype=np.int64) for c, p in self.profile["categorical"].items()}
+            self.level_index = {c: {v: i for i, v in enumerate(p["levels"])} for c, p in self.profile["categorical"].items()}
+            self.score = np.zeros(len(SCORE_EDGES) + 1, dtype=np.int64)
+
+    def update_record(self, record: dict, score: float = None):
+        """
+        Fast path for a single request, no DataFrame construction
+        """
+        with self._lock:
+            self.n_rows += 1
+            for c, counts in self.numeric.items():
+                if c not in record:
+                    continue
+                try:
+                    v = float(record[c])
+                except (TypeError, ValueError):
+                    v = 0.0
+                counts[np.searchsorted(self.edges[c], 0.0 if np.isnan(v) else v, side="right")] += 1
+            for c, counts in self.categorical.items():
+                if c in record:
+                    index = self.level_index[c]
+                    counts[index.get(str(record[c]).strip(), index[OTHER])] += 1
+            if score is not None:
+                self.score[np.searchsorted(SCORE_EDGES, score, side="right")] += 1
+
+    def update(self, df: pd.DataFrame, scores=None):
+        """
+        Vectorized update for a batch of raw customer records
+        """
+        numeric = {c: _bin_counts(_numeric(df[c]), self.edges[c]) for c in self.numeric if c in df.columns}
+        categorical = {}
+        for c in self.categorical:
+            if c in df.columns:
+                index = self.level_index[c]
+                codes = df[c].astype(str).str.strip().map(index).fillna(index[OTHER]).astype(int)
+                categorical[c] = np.bincount(codes, minlength=len(index))
+
+        with self._lock:
+            self.n_rows += len(df)
+            for c, counts in numeric.items():
+                self.numeric[c] += counts
+            for c, counts in categorical.items():
+                self.categorical[c] += counts
+            if scores is not None:
+                self.score += _bin_counts(np.asarray(scores, dtype=float), SCORE_EDGES)
+
+    def report(self) -> dict:
+        """
+        PSI (and binned KS for numeric features and scores) against the reference
+        """
+        with self._lock:
+            features = {}
+            for c, counts in self.numeric.items():
+                ref = self.profile["numeric"][c]["counts"]
+                value = psi(ref, counts)
+                features[c] = {"psi": value, "ks": ks(ref, counts), "status": _status(value)}
+            for c, counts in self.categorical.items():
+                ref = self.profile["categorical"][c]["counts"]
+                value = psi(ref, counts)
+                features[c] = {"psi": value, "ks": None, "status": _status(value)}
+
+            out = {"n_rows": self.n_rows, "features": features}
+            if "score" in self.profile:
+                profile_version = self.profile.get("model_version")
+                if profile_version is None or profile_version != self.model_version:
+                    # Another model's score histogram says nothing about this one
+                    out["score"] = {
+                        "psi": None, "ks": None, "status": "model_mismatch",
+                        "profile_model_version": profile_version, "model_version": self.model_version,
+                    }
+                else:
+                    ref = self.profile["score"]["counts"]
+                    value = psi(ref, self.score)
+                    out["score"] = {"psi": value, "ks": ks(ref, self.score), "status": _status(value)}
+            return out
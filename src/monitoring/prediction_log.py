@@ -0,0 +1,157 @@
+import os
+import json
+import glob
+import time
+import sqlite3
+import threading
+from collections import deque
+import pandas as pd
+
+COLUMNS = ["ts", "model_version", "features", "probability", "label", "latency_ms"]
+
+class PredictionLogger:
+    """
+    Non-blocking prediction log.
+
+    Request threads only append to an in-memory ring buffer bounded by rows
+    (a batch request is queued as chunks of up to batch_size rows). When the
+    buffer is full the oldest entries are dropped and their rows counted; an entry
+    larger than the whole buffer is dropped itself. A daemon thread drains the
+    buffer in batches into rotating SQLite files, so disk I/O never happens on
+    the request path.
+    """
+
+    def __init__(self, log_dir: str, max_buffer: int = 100000, batch_size: int = 1000,
+                 flush_interval: float = 2.0, rotate_rows: int = 1000000):
+        self.log_dir = log_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rotate_rows = rotate_rows
+
+        self.max_buffer = max_buffer
+        self._buffer = deque()
+        self._buffered_rows = 0
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.written = 0
+
+        self._conn = None
+        self._file_rows = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="prediction-log-writer", daemon=True)
+
+        os.makedirs(log_dir, exist_ok=True)
+        self._thread.start()
+
+    def _append(self, entry: tuple, n_rows: int):
+        with self._lock:
+            # An entry larger than the whole buffer can never fit, drop it and keep the buffer
+            if n_rows > self.max_buffer:
+                self.dropped += n_rows
+                return
+            # Drop the oldest entries until the new rows fit
+            while self._buffer and self._buffered_rows + n_rows > self.max_buffer:
+                old = self._buffer.popleft()
+                self._buffered_rows -= old[-1]
+                self.dropped += old[-1]
+            self._buffer.append(entry + (n_rows,))
+            self._buffered_rows += n_rows
+
+    def log(self, features: dict, probability: float, label: str, model_version: str, latency_ms: float):
+        self._append((time.time(), model_version, features, probability, label, latency_ms), 1)
+
+    def log_batch(self, df: pd.DataFrame, probabilities, labels, model_version: str, latency_ms: float):
+        """
+        Queue a batch as chunks of up to batch_size rows, rows are expanded by
+        the writer thread. Latency is logged as the per-row share of the batch call.
+        """
+        per_row = latency_ms / max(len(df), 1)
+        probabilities, labels = list(probabilities), list(labels)
+        now = time.time()
+        for start in range(0, len(df), self.batch_size):
+            end = start + self.batch_size
+            chunk = df.iloc[start:end]
+            self._append((now, model_version, chunk, probabilities[start:end], labels[start:end], per_row), len(chunk))
+
+    def _open(self):
+        path = os.path.join(self.log_dir, f"predictions-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.sqlite")
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions "
+            "(ts REAL, model_version TEXT, features TEXT, probability REAL, label TEXT, latency_ms REAL)"
+        )
+        conn.commit()
+        return conn
+
+    def _write(self, batch: list):
+        if self._conn is None or self._file_rows >= self.rotate_rows:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = self._open()
+            self._file_rows = 0
+
+        rows = []
+        for ts, v, f, p, l, ms, _ in batch:
+            if isinstance(f, pd.DataFrame):
+                rows.extend(
+                    (ts, v, json.dumps(r, default=str), float(pr), lb, ms)
+                    for r, pr, lb in zip(f.to_dict("records"), p, l)
+                )
+            else:
+                rows.append((ts, v, json.dumps(f, default=str), p, l, ms))
+        with self._conn:
+            self._conn.executemany("INSERT INTO predictions VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._file_rows += len(rows)
+        self.written += len(rows)
+
+    def _take(self) -> list:
+        batch, n_rows = [], 0
+        with self._lock:
+            while self._buffer and n_rows < self.batch_size:
+                entry = self._buffer.popleft()
+                self._buffered_rows -= entry[-1]
+                n_rows += entry[-1]
+                batch.append(entry)
+        return batch
+
+    def flush(self):
+        batch = self._take()
+        while batch:
+            self._write(batch)
+            batch = self._take()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Prediction log flush failed: {e}")
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def stats(self) -> dict:
+        return {"buffered": self._buffered_rows, "written": self.written, "dropped": self.dropped}
+
+def read_prediction_logs(log_dir: str, since: float = None) -> pd.DataFrame:
+    """
+    Load logged predictions with the request features expanded into columns,
+    ready for the drift report or as retraining input.
+    """
+    frames = []
+    for path in sorted(glob.glob(os.path.join(log_dir, "predictions-*.sqlite"))):
+        with sqlite3.connect(path) as conn:
+            query = "SELECT * FROM predictions" + (" WHERE ts >= ?" if since else "")
+            frames.append(pd.read_sql_query(query, conn, params=(since,) if since else None))
+
+    if not frames:
+        return pd.DataFrame(columns=COLUMNS)
+
+    logs = pd.concat(frames, ignore_index=True)
+    features = pd.DataFrame([json.loads(f) for f in logs["features"]], index=logs.index)
+    return pd.concat([logs.drop(columns=["features"]), features], axis=1)
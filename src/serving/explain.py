@@ -0,0 +1,85 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from serving.inference import clf, FEATURE_COLS, ID_COLS, _serve_transform
+from utils.schema import source_field
+
+if not hasattr(clf, "get_booster"):
+    raise ImportError("Explanations need the xgboost model, not available with SERVING_BACKEND=numpy")
+booster = clf.get_booster()
+
+# Roll-up matrix from encoded columns to their source fields, built once at import
+SOURCE_FIELDS = list(dict.fromkeys(source_field(c) for c in FEATURE_COLS))
+ROLLUP = np.zeros((len(FEATURE_COLS), len(SOURCE_FIELDS)), dtype=np.float32)
+for i, c in enumerate(FEATURE_COLS):
+    ROLLUP[i, SOURCE_FIELDS.index(source_field(c))] = 1.0
+
+def _contributions(X: np.ndarray) -> np.ndarray:
+    """
+    TreeSHAP contributions per source field, in log-odds units.
+    Last column is the bias (expected model output).
+    """
+    dm = xgb.DMatrix(X, feature_names=FEATURE_COLS)
+    contribs = booster.predict(dm, pred_contribs=True)
+    grouped = contribs[:, :-1] @ ROLLUP
+    return np.hstack([grouped, contribs[:, -1:]])
+
+@lru_cache(maxsize=4096)
+def _cached_contributions(row_bytes: bytes) -> np.ndarray:
+    row = np.frombuffer(row_bytes, dtype=np.float32).reshape(1, -1)
+    return _contributions(row)[0]
+
+def _clamp_top_n(top_n: int) -> int:
+    # At least one driver, at most every source field
+    return min(max(int(top_n), 1), len(SOURCE_FIELDS))
+
+def _top_order(contribs: np.ndarray, top_n: int) -> np.ndarray:
+    # Per row, the source field indices of the top-N |contribution|, largest first
+    n = _clamp_top_n(top_n)
+    idx = np.argpartition(-np.abs(contribs), n - 1, axis=1)[:, :n]
+    order = np.argsort(-np.abs(np.take_along_axis(contribs, idx, axis=1)), axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1)
+
+def _top_drivers(row: np.ndarray, top_n: int) -> list:
+    values = row[:-1]
+    return [{"feature": SOURCE_FIELDS[i], "contribution": float(values[i])} for i in _top_order(values[None, :], top_n)[0]]
+
+def explain(input_dict: dict, top_n: int = 5) -> dict:
+    """
+    Top-N churn drivers for a single customer. Identical encoded rows hit an LRU cache.
+    """
+    X = _serve_transform(pd.DataFrame([input_dict])).to_numpy(dtype=np.float32)
+    row = _cached_contributions(X[0].tobytes())
+    return {
+        "base_value": float(row[-1]),
+        "drivers": _top_drivers(row, top_n),
+    }
+
+def explain_file(source, output: str, top_n: int = 5, chunksize: int = 50000) -> int:
+    """
+    Stream a customer csv and write the top-N drivers of every customer to a csv.
+    Returns the number of customers explained.
+    """
+    total = 0
+    for n_chunk, chunk in enumerate(pd.read_csv(source, chunksize=chunksize)):
+        chunk.columns = chunk.columns.str.strip()
+        id_col = next((c for c in ID_COLS if c in chunk.columns), None)
+
+        out = pd.DataFrame(index=chunk.index)
+        out["customerID"] = chunk[id_col].astype(str) if id_col else chunk.index.astype(str)
+
+        contribs = _contributions(_serve_transform(chunk).to_numpy(dtype=np.float32))[:, :-1]
+        order = _top_order(contribs, top_n)
+        names = np.asarray(SOURCE_FIELDS, dtype=object)[order]
+        values = np.take_along_axis(contribs, order, axis=1)
+
+        for j in range(order.shape[1]):
+            out[f"driver_{j + 1}"] = names[:, j]
+            out[f"contribution_{j + 1}"] = values[:, j]
+
+        out.to_csv(output, mode="w" if n_chunk == 0 else "a", header=n_chunk == 0, index=False)
+        total += len(out)
+
+    return total
@@ -1,9 +1,13 @@
 import os
+import numpy as np
 import pandas as pd
-import mlflow
+import joblib
 import glob
 from pathlib import Path
 
+from models.calibrate import apply_calibrator
+from utils.schema import source_field
+
 # 1. Setup Paths Dynamicallly
 CURRENT_DIR = Path(__file__).resolve().parent
 MODEL_FOLDER_NAME = "m-e2655f75ee9a490ab154aef6b4cfbe19"
@@ -17,62 +21,128 @@ MODEL_URI = MODEL_PATH.as_uri()
 # For OS operations: Needs a standard string path (starts with C:\)
 MODEL_PATH_STR = str(MODEL_PATH)
 
-print(f"Attempting to load model from URI: {MODEL_URI}")
+PROJECT_ARTIFACTS_DIR = CURRENT_DIR.parent.parent / "artifacts"
 
-# 3. Load Model
-try:
-    model = mlflow.pyfunc.load_model(MODEL_URI)
-    print(f"Model Loaded Successfully From {MODEL_URI}")
-    
-    # Update MODEL_DIR to the successful path so subsequent steps use the correct one
-    # We use the string path for file reading later
-    ACTIVE_MODEL_DIR_STR = MODEL_PATH_STR
+# "mlflow" loads the logged pyfunc model, "numpy" serves the exported tree
+# arrays (models/export_trees.py) without mlflow or xgboost installed
+SERVING_BACKEND = os.getenv("SERVING_BACKEND", "mlflow").lower()
+
+if SERVING_BACKEND == "numpy":
+    from serving.tree_predictor import TreeEnsemblePredictor
+
+    trees_file = os.getenv("TREES_FILE")
+    if not trees_file:
+        candidates = [os.path.join(MODEL_PATH_STR, "trees.npz"), str(PROJECT_ARTIFACTS_DIR / "trees.npz")]
+        trees_file = next((c for c in candidates if os.path.exists(c)), None)
+    if not trees_file:
+        raise Exception("SERVING_BACKEND=numpy but no trees.npz found, run scripts/export_trees.py first")
 
-except Exception as e:
-    print(f"Primary load failed: {e}")
-    print("Attempting fallback to local mlruns...")
+    clf = TreeEnsemblePredictor.load(trees_file)
+    ACTIVE_MODEL_DIR_STR = os.path.dirname(os.path.abspath(trees_file))
+    FEATURE_COLS = clf.feature_names
+    MODEL_VERSION = clf.model_version or os.path.basename(trees_file)
+    print(f"Loaded {len(clf.groups)} tree groups over {len(FEATURE_COLS)} features from {trees_file}")
 
+else:
+    import mlflow
+
+    print(f"Attempting to load model from URI: {MODEL_URI}")
+
+    # 3. Load Model
     try:
-        # Fallback Logic
-        # Note: This looks for mlruns relative to where you run the command
-        local_model_paths = glob.glob("mlruns/*/*/models")
+        model = mlflow.pyfunc.load_model(MODEL_URI)
+        print(f"Model Loaded Successfully From {MODEL_URI}")
+    
+        # Update MODEL_DIR to the successful path so subsequent steps use the correct one
+        # We use the string path for file reading later
+        ACTIVE_MODEL_DIR_STR = MODEL_PATH_STR
+
+    except Exception as e:
+        print(f"Primary load failed: {e}")
+        print("Attempting fallback to local mlruns...")
+
+        try:
+            # Fallback Logic
+            # Note: This looks for mlruns relative to where you run the command
+            local_model_paths = glob.glob("mlruns/*/*/models")
         
-        if not local_model_paths:
-            # Try looking one level up if running from src
-            local_model_paths = glob.glob("../mlruns/*/*/models")
+            if not local_model_paths:
+                # Try looking one level up if running from src
+                local_model_paths = glob.glob("../mlruns/*/*/models")
 
-        if local_model_paths:
-            latest_model = max(local_model_paths, key=os.path.getmtime)
-            print(f"Fallback: Found latest model at {latest_model}")
+            if local_model_paths:
+                latest_model = max(local_model_paths, key=os.path.getmtime)
+                print(f"Fallback: Found latest model at {latest_model}")
             
-            # Load the fallback model
-            model = mlflow.pyfunc.load_model(latest_model)
+                # Load the fallback model
+                model = mlflow.pyfunc.load_model(latest_model)
             
-            # Update the directory string to point to this new fallback location
-            # assuming feature_columns.txt is inside the artifacts folder of the run
-            ACTIVE_MODEL_DIR_STR = latest_model
+                # Update the directory string to point to this new fallback location
+                # assuming feature_columns.txt is inside the artifacts folder of the run
+                ACTIVE_MODEL_DIR_STR = latest_model
             
-            print(f"Fallback: Loaded model from {latest_model}")
-        else:
-            raise Exception("No model found in primary path OR local mlruns")
+                print(f"Fallback: Loaded model from {latest_model}")
+            else:
+                raise Exception("No model found in primary path OR local mlruns")
 
-    except Exception as fallback_error:
-        raise Exception(f"Failed to load Model. Primary error: {e}. Fallback error: {fallback_error}")
+        except Exception as fallback_error:
+            raise Exception(f"Failed to load Model. Primary error: {e}. Fallback error: {fallback_error}")
 
-# 4. Feature Schema Loading
-try:
-    # FIX: Use the standard string path (ACTIVE_MODEL_DIR_STR), NOT the URI
-    feature_file = os.path.join(ACTIVE_MODEL_DIR_STR, "feature_columns.txt")
+    # 4. Feature Schema Loading
+    try:
+        # FIX: Use the standard string path (ACTIVE_MODEL_DIR_STR), NOT the URI
+        feature_file = os.path.join(ACTIVE_MODEL_DIR_STR, "feature_columns.txt")
     
-    print(f"Loading features from: {feature_file}")
+        print(f"Loading features from: {feature_file}")
     
-    with open(feature_file, "r") as f:
-        FEATURE_COLS = [ln.strip() for ln in f if ln.strip()]
+        with open(feature_file, "r") as f:
+            FEATURE_COLS = [ln.strip() for ln in f if ln.strip()]
         
-    print(f"Loaded {len(FEATURE_COLS)} feature columns from training")
+        print(f"Loaded {len(FEATURE_COLS)} feature columns from training")
     
-except Exception as e:
-    raise Exception(f"Failed to load feature columns: {e}")
+    except Exception as e:
+        raise Exception(f"Failed to load feature columns: {e}")
+
+    # Underlying XGBClassifier, used for raw churn scores instead of hard labels
+    clf = model.get_raw_model()
+
+    # Recorded with every logged prediction and precomputed score
+    MODEL_VERSION = model.metadata.model_uuid or os.path.basename(os.path.normpath(ACTIVE_MODEL_DIR_STR))
+
+def _artifact_path(name: str):
+    """
+    Locate an artifact saved next to the model, falling back to the
+    project artifacts folder written by run_pipeline.py.
+    """
+    for folder in (ACTIVE_MODEL_DIR_STR, str(PROJECT_ARTIFACTS_DIR)):
+        path = os.path.join(folder, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+# 5. Probability Calibrator (optional)
+def load_calibrator(path: str, model_version: str):
+    """
+    Calibrator saved by run_pipeline.py, or None when there is none or it was
+    fitted for another model (artifacts/calibrator.pkl may come from a newer run)
+    """
+    calibrator = joblib.load(path) if path else None
+    if calibrator is None:
+        print("No calibrator found, serving raw model scores")
+    elif calibrator.get("model_version") != model_version:
+        print(f"Ignoring calibrator {path} fitted for model {calibrator.get('model_version')}, serving raw model {model_version} scores")
+        calibrator = None
+    else:
+        print(f"Loaded {calibrator['method']} calibrator from {path}")
+    return calibrator
+
+def decision_threshold(calibrator) -> float:
+    # Labels are cut on the returned probability, so label and probability never
+    # disagree. The cut is the calibrated value of the model's own 0.5 raw cut-off.
+    return float(apply_calibrator(calibrator, [0.5])[0])
+
+CALIBRATOR = load_calibrator(_artifact_path("calibrator.pkl"), MODEL_VERSION)
+DECISION_THRESHOLD = decision_threshold(CALIBRATOR)
 
 # Deterministic binary feature mappings
 BINARY_MAP = {
@@ -85,63 +155,134 @@ BINARY_MAP = {
 
 NUMERIC_COLS = ["tenure", "MonthlyCharges", "TotalCharges"]
 
+ID_COLS = ["customerID", "CustomerID", "customer_id"]
+
+def _encoding_plan(feature_cols: list) -> list:
+    """
+    How to build each model column from the raw input fields:
+    binary mapping, numeric passthrough or one-hot level of a source field.
+    """
+    plan = []
+    for col in feature_cols:
+        field = source_field(col)
+        if col in BINARY_MAP:
+            plan.append(("binary", col, BINARY_MAP[col]))
+        elif field != col:
+            plan.append(("onehot", field, col[len(field) + 1:]))
+        else:
+            plan.append(("numeric", col, None))
+    return plan
+
+ENCODING_PLAN = _encoding_plan(FEATURE_COLS)
+
+def encode_columns(columns: dict, n_rows: int = None) -> np.ndarray:
+    """
+    Encode column arrays {field: values} straight into the model matrix.
+
+    Each categorical field is factorized once and every level column is a
+    lookup on the codes, so no per-record objects or get_dummies frames are
+    built. Missing fields, unknown levels and unparsable numbers encode as 0,
+    like the training-time fillna.
+    """
+    if n_rows is None:
+        n_rows = len(next(iter(columns.values()))) if columns else 0
+
+    X = np.zeros((n_rows, len(FEATURE_COLS)), dtype=np.float32)
+    factorized = {}
+
+    def _levels(field):
+        # codes are -1 for missing values, which index the trailing 0 of every lookup
+        if field not in factorized:
+            values = columns[field]
+            if not isinstance(values, (np.ndarray, pd.Categorical)):
+                values = np.asarray(values, dtype=object)
+            codes, uniques = pd.factorize(values)
+            factorized[field] = (codes, [str(u).strip() for u in uniques])
+        return factorized[field]
+
+    for j, (kind, field, arg) in enumerate(ENCODING_PLAN):
+        if field not in columns:
+            continue
+        if kind == "numeric":
+            values = pd.to_numeric(pd.Series(columns[field]), errors="coerce").to_numpy(dtype=np.float32)
+            X[:, j] = np.nan_to_num(values, nan=0.0)
+        else:
+            codes, uniques = _levels(field)
+            if kind == "binary":
+                lookup = [arg.get(u, 0) for u in uniques]
+            else:
+                lookup = [u == arg for u in uniques]
+            X[:, j] = np.asarray(lookup + [0], dtype=np.float32)[codes]
+
+    return X
+
 def _serve_transform(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     # Clean Columns
     df.columns = df.columns.str.strip()
-    
-    for c in NUMERIC_COLS:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-            df[c] = df[c].fillna(0)
-
-    for c, mapping in BINARY_MAP.items():
-        if c in df.columns:
-            df[c] = (
-                df[c]
-                .astype(str)
-                .str.strip()
-                .map(mapping)
-                .astype("Int64")
-                .fillna(0)
-                .astype(int)
-            )
-            
-    # FIX: Corrected pandas syntax for selecting object columns
-    # Old/Buggy: df.select_dtypes(include=["object"].columns)
-    # New/Fixed: df.select_dtypes(include=["object"]).columns
-    obj_cols = df.select_dtypes(include=["object"]).columns.tolist()
+    df = df.drop(columns=[c for c in ID_COLS if c in df.columns])
 
-    if obj_cols:
-        df = pd.get_dummies(df, columns=obj_cols, drop_first=True)
+    X = encode_columns({c: df[c].to_numpy() for c in df.columns}, n_rows=len(df))
 
-    bool_cols = df.select_dtypes(include=["bool"]).columns
-    if len(bool_cols) > 0:
-        df[bool_cols] = df[bool_cols].astype(int)
+    # Exactly the columns the model expects, in the right order
+    return pd.DataFrame(X, columns=FEATURE_COLS, index=df.index)
 
-    # Reindex ensures we have exactly the columns the model expects, in the right order
-    df = df.reindex(columns=FEATURE_COLS, fill_value=0)
-    return df
-
-def predict(input_dict: dict) -> str:
-    df = pd.DataFrame([input_dict])
-    df_enc = _serve_transform(df)
-    
+def _score(df_enc: pd.DataFrame) -> np.ndarray:
+    """
+    Raw positive-class scores for already encoded features
+    """
     try:
-        preds = model.predict(df_enc)
-
-        if hasattr(preds, "tolist"):
-            preds = preds.tolist()
-            
-        if isinstance(preds, (list, tuple)) and len(preds) == 1:
-            result = preds[0]
-        else:
-            result = preds
-            
+        return clf.predict_proba(df_enc)[:, 1]
     except Exception as e:
         raise Exception(f"Model predictions failed: {e}")
-    
-    if result == 1:
+
+def _label(proba: float) -> str:
+    if proba > DECISION_THRESHOLD:
         return "Likely to Churn"
     else:
-        return "Not Likely to Churn"
\ No newline at end of file
+        return "Not Likely to Churn"
+
+def raw_scores_batch(df: pd.DataFrame) -> np.ndarray:
+    """
+    Uncalibrated model scores for a frame of raw customer records.
+    Isotonic calibration ties close scores, rank on these instead.
+    """
+    return _score(_serve_transform(df))
+
+def calibrate_scores(raw: np.ndarray) -> np.ndarray:
+    return apply_calibrator(CALIBRATOR, raw)
+
+def predict_proba_batch(df: pd.DataFrame) -> np.ndarray:
+    """
+    Calibrated churn probabilities for a frame of raw customer records
+    """
+    return calibrate_scores(raw_scores_batch(df))
+
+def predict_encoded(X: np.ndarray) -> dict:
+    """
+    Labels and calibrated probabilities for an already encoded model matrix
+    """
+    proba = calibrate_scores(_score(X))
+    return {
+        "prediction": [_label(p) for p in proba],
+        "churn_probability": proba,
+    }
+
+def predict_columns(columns: dict) -> dict:
+    """
+    Column-oriented scoring for already validated batches: {field: values}
+    in, {"prediction": [...], "churn_probability": [...]} out.
+    """
+    return predict_encoded(encode_columns(columns))
+
+def predict_with_proba(input_dict: dict) -> dict:
+    raw = _score(encode_columns({k: [v] for k, v in input_dict.items()}, n_rows=1))
+    proba = float(calibrate_scores(raw)[0])
+
+    return {
+        "prediction": _label(proba),
+        "churn_probability": proba,
+    }
+
+def predict(input_dict: dict) -> str:
+    return predict_with_proba(input_dict)["prediction"]
@@ -0,0 +1,64 @@
+import heapq
+import numpy as np
+import pandas as pd
+
+from serving.inference import raw_scores_batch, calibrate_scores, ID_COLS
+
+def _find_id_col(columns, id_col=None):
+    if id_col:
+        if id_col not in columns:
+            raise ValueError(f"ID column {id_col} not found in the customer file")
+        return id_col
+    for c in ID_COLS:
+        if c in columns:
+            return c
+    return None
+
+def rank_top_k(source, k: int = 50000, chunksize: int = 50000, id_col: str = None) -> list:
+    """
+    Stream a customer csv through the model and keep the K customers most likely to churn.
+
+    Only one chunk and a K-sized min-heap are held in memory, so memory is
+    O(K + chunksize) no matter how many customers the file contains.
+    Customers are ranked on the raw model score, which the isotonic
+    calibrator would collapse into ties, and returned with their calibrated
+    churn probability.
+    """
+    if k <= 0:
+        raise ValueError("k must be a positive integer")
+
+    heap = []   # (raw_score, row_number, customer_id), smallest score on top
+    row_offset = 0
+
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        chunk.columns = chunk.columns.str.strip()
+        key = _find_id_col(chunk.columns, id_col)
+
+        score = raw_scores_batch(chunk)
+        ids = chunk[key].astype(str).to_numpy() if key else np.arange(row_offset, row_offset + len(chunk))
+
+        # Only the chunk's own top-K can ever enter the global top-K
+        if len(score) > k:
+            idx = np.argpartition(score, -k)[-k:]
+        else:
+            idx = np.arange(len(score))
+
+        # Once the heap is full, skip everything below its current minimum
+        if len(heap) == k:
+            idx = idx[score[idx] > heap[0][0]]
+
+        for i in idx:
+            item = (float(score[i]), row_offset + int(i), ids[i])
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+        row_offset += len(chunk)
+
+    ranked = sorted(heap, key=lambda t: (-t[0], t[1]))
+    proba = calibrate_scores([t[0] for t in ranked])
+    return [
+        {"rank": r + 1, "customerID": str(cid), "churn_probability": float(p)}
+        for r, ((_, _, cid), p) in enumerate(zip(ranked, proba))
+    ]
@@ -0,0 +1,219 @@
+import os
+import json
+import time
+import shutil
+import numpy as np
+import pandas as pd
+
+from serving.inference import FEATURE_COLS, ID_COLS, MODEL_VERSION, _serve_transform, predict_encoded
+
+# Index layout: <index_dir>/CURRENT names the live version folder, which holds
+#   ids.npy      sorted fixed-width customerIDs (UTF-8 bytes)
+#   proba.npy    calibrated churn probability (float32)
+#   label.npy    1 = Likely to Churn (int8)
+#   features.npy encoded model inputs (float32), used to rescore on a model change
+#   meta.json    model_version, feature_columns, n_customers, created
+ARRAYS = ["ids", "proba", "label", "features"]
+
+def _score_features(X: np.ndarray) -> tuple:
+    out = predict_encoded(X)
+    proba = np.asarray(out["churn_probability"], dtype=np.float32)
+    label = np.asarray([p == "Likely to Churn" for p in out["prediction"]], dtype=np.int8)
+    return proba, label
+
+def _score_file(source, chunksize: int = 50000) -> dict:
+    ids, proba, label, features = [], [], [], []
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        chunk.columns = chunk.columns.str.strip()
+        id_col = next((c for c in ID_COLS if c in chunk.columns), None)
+        if id_col is None:
+            raise ValueError("The customer file needs a customerID column to build the score index")
+
+        if len(chunk) == 0:
+            continue
+        X = _serve_transform(chunk).to_numpy(dtype=np.float32)
+        chunk_proba, chunk_label = _score_features(X)
+
+        ids.append(chunk[id_col].astype(str).str.strip().to_numpy())
+        proba.append(chunk_proba)
+        label.append(chunk_label)
+        features.append(X)
+
+    if not ids:
+        return {
+            "ids": np.empty(0, dtype="S1"),
+            "proba": np.empty(0, dtype=np.float32),
+            "label": np.empty(0, dtype=np.int8),
+            "features": np.empty((0, len(FEATURE_COLS)), dtype=np.float32),
+        }
+
+    return {
+        # UTF-8 like the lookup keys, plain astype("S") rejects non-ASCII ids
+        "ids": np.char.encode(np.concatenate(ids).astype(str), "utf-8"),
+        "proba": np.concatenate(proba),
+        "label": np.concatenate(label),
+        "features": np.vstack(features),
+    }
+
+def _sorted_unique(arrays: dict) -> dict:
+    # Stable sort and keep the last occurrence of a duplicated id
+    if len(arrays["ids"]) == 0:
+        return arrays
+    order = np.argsort(arrays["ids"], kind="stable")
+    ids = arrays["ids"][order]
+    keep = np.r_[ids[1:] != ids[:-1], True]
+    return {k: v[order][keep] for k, v in arrays.items()}
+
+def _write_version(index_dir: str, arrays: dict) -> str:
+    # Nanoseconds keep back-to-back writes (build then refresh) apart and sortable
+    now = time.time_ns()
+    version = time.strftime("v%Y%m%d-%H%M%S", time.localtime(now // 10**9)) + f"-{now % 10**9:09d}-{os.getpid()}"
+    folder = os.path.join(index_dir, version)
+    os.makedirs(folder)
+
+    for name in ARRAYS:
+        np.save(os.path.join(folder, f"{name}.npy"), arrays[name])
+    with open(os.path.join(folder, "meta.json"), "w") as f:
+        json.dump({
+            "model_version": MODEL_VERSION,
+            "feature_columns": FEATURE_COLS,
+            "n_customers": int(len(arrays["ids"])),
+            "created": time.time(),
+        }, f)
+
+    # Atomic switch: readers see either the old or the new version, never a mix
+    tmp = os.path.join(index_dir, "CURRENT.tmp")
+    with open(tmp, "w") as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(index_dir, "CURRENT"))
+
+    # Keep the previous version around for readers still holding its mmaps
+    versions = sorted(d for d in os.listdir(index_dir) if d.startswith("v"))
+    for old in versions[:-2]:
+        shutil.rmtree(os.path.join(index_dir, old), ignore_errors=True)
+
+    return folder
+
+def build_score_index(source, index_dir: str, chunksize: int = 50000) -> int:
+    """
+    Score the whole customer base and write a fresh index. Returns the number of customers.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    arrays = _sorted_unique(_score_file(source, chunksize))
+    _write_version(index_dir, arrays)
+    return len(arrays["ids"])
+
+def refresh_score_index(source, index_dir: str, chunksize: int = 50000) -> int:
+    """
+    Rescore only the customers in `source` (changed or new) and merge them into
+    the current index. If the index was built with another model version, the
+    stored features of the other customers are rescored too. Returns the
+    number of customers in the new index.
+    """
+    current = ScoreIndex(index_dir)
+    if current.meta is None:
+        return build_score_index(source, index_dir, chunksize)
+    if current.meta["feature_columns"] != FEATURE_COLS:
+        raise ValueError("Feature columns changed since the index was built, run a full build instead")
+
+    changed = _sorted_unique(_score_file(source, chunksize))
+    old = {name: np.asarray(current.arrays[name]) for name in ARRAYS}
+
+    # Rows kept from the old index must carry the current model's score, since
+    # the new version is stamped with MODEL_VERSION as a whole
+    rescore = current.meta["model_version"] != MODEL_VERSION
+    if rescore:
+        print(f" Index built with model {current.meta['model_version']}, rescoring stored features with {MODEL_VERSION}")
+        scored = [_score_features(old["features"][i:i + chunksize]) for i in range(0, len(old["ids"]), chunksize)]
+        if scored:
+            old["proba"] = np.concatenate([p for p, _ in scored])
+            old["label"] = np.concatenate([l for _, l in scored])
+
+    if len(changed["ids"]) == 0:
+        if rescore:
+            _write_version(index_dir, old)
+        return len(old["ids"])
+
+    # Drop the old rows of every changed customer, then merge and re-sort
+    width = max(old["ids"].dtype.itemsize, changed["ids"].dtype.itemsize)
+    old["ids"] = old["ids"].astype(f"S{width}")
+    changed["ids"] = changed["ids"].astype(f"S{width}")
+    pos = np.clip(np.searchsorted(changed["ids"], old["ids"]), 0, len(changed["ids"]) - 1)
+    stale = changed["ids"][pos] == old["ids"]
+
+    merged = {name: np.concatenate([old[name][~stale], changed[name]]) for name in ARRAYS}
+    merged = _sorted_unique(merged)
+    _write_version(index_dir, merged)
+    return len(merged["ids"])
+
+class ScoreIndex:
+    """
+    Read side of the index: memory-mapped arrays and binary search on the
+    sorted ids, so a lookup touches a handful of pages and no model code.
+    Picks up a new version written by the offline job without a restart.
+    """
+
+    def __init__(self, index_dir: str, reload_interval: float = 1.0):
+        self.index_dir = index_dir
+        self.reload_interval = reload_interval
+        # (version, meta, arrays) swapped as one object so lookups never mix versions
+        self._state = (None, None, {})
+        self._checked = 0.0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.index_dir, "CURRENT")) as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return
+        if version == self._state[0]:
+            return
+
+        folder = os.path.join(self.index_dir, version)
+        with open(os.path.join(folder, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+
+        self._state = (version, meta, arrays)
+
+    @property
+    def meta(self):
+        return self._state[1]
+
+    @property
+    def arrays(self):
+        return self._state[2]
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked >= self.reload_interval:
+            self._checked = now
+            self._load()
+
+    def lookup(self, customer_id: str):
+        """
+        Indexed score for a customer, or None if the id is not in the index
+        """
+        self._maybe_reload()
+        _, meta, arrays = self._state
+        if meta is None:
+            return None
+
+        ids = arrays["ids"]
+        key = str(customer_id).strip().encode("utf-8")
+        if len(key) > ids.dtype.itemsize:
+            return None
+
+        i = int(np.searchsorted(ids, key))
+        if i >= len(ids) or ids[i] != key:
+            return None
+
+        return {
+            "customerID": customer_id,
+            "churn_probability": float(arrays["proba"][i]),
+            "prediction": "Likely to Churn" if arrays["label"][i] else "Not Likely to Churn",
+            "model_version": meta["model_version"],
+            "feature_columns": meta["feature_columns"],
+            "features": arrays["features"][i:i + 1],
+        }
@@ -0,0 +1,155 @@
+import numpy as np
+
+class TreeEnsemblePredictor:
+    """
+    NumPy-only evaluator for a tree ensemble exported by models/export_trees.py.
+
+    At load time every tree up to max_padded_depth is laid out as a complete
+    binary tree of its depth (shorter branches are padded with always-left
+    nodes), so the children of position i are 2i+1 / 2i+2. Deeper trees
+    (lossguide / max_depth=0 models) would need 2^depth slots each, so they
+    keep the exported node table and follow its child pointers instead.
+    Prediction then works on blocks of rows:
+
+    1. all trees advance one level per step: gather each tree's split
+       feature and threshold at its current node, compare in float32
+       like XGBoost (NaN follows the default direction) and step to a child,
+       so the Python loop runs max_depth times per block and depth group;
+    2. leaf values are gathered and summed onto the base margin.
+
+    Exposes predict_proba so it can stand in for the XGBClassifier at serving.
+    """
+
+    def __init__(self, arrays: dict, block_rows: int = 1024, max_padded_depth: int = 10):
+        self.objective = str(arrays["objective"])
+        self.base_margin = np.float32(arrays["base_margin"])
+        self.feature_names = [str(f) for f in arrays["feature_names"]]
+        self.model_version = str(arrays["model_version"]) if "model_version" in arrays else ""
+        self.block_rows = block_rows
+        self.max_padded_depth = max_padded_depth
+        self._build_layout(arrays)
+
+    @classmethod
+    def load(cls, path: str, **kwargs):
+        with np.load(path) as data:
+            arrays = {k: data[k] for k in data.files}
+        return cls(arrays, **kwargs)
+
+    def _tree_depth(self, root: int, left, right) -> int:
+        depth, stack = 0, [(root, 0)]
+        while stack:
+            node, d = stack.pop()
+            if left[node] == node:
+                depth = max(depth, d)
+            else:
+                stack.extend([(int(left[node]), d + 1), (int(right[node]), d + 1)])
+        return depth
+
+    def _build_layout(self, arrays: dict):
+        left, right = arrays["left"], arrays["right"]
+
+        # Trees are grouped by depth so shallow trees are not padded to the
+        # deepest one; single-leaf trees are constants folded into the margin
+        by_depth = {}
+        for root in arrays["roots"]:
+            root = int(root)
+            depth = self._tree_depth(root, left, right)
+            if depth == 0:
+                self.base_margin += arrays["value"][root]
+            else:
+                by_depth.setdefault(depth, []).append(root)
+
+        # Trees too deep to pad walk the node table, where leaves point to themselves
+        deep = {d: r for d, r in by_depth.items() if d > self.max_padded_depth}
+        self.deep = None
+        if deep:
+            self.deep = {
+                "depth": max(deep),
+                "roots": np.asarray(sorted(r for roots in deep.values() for r in roots), dtype=np.int32),
+                "feature": arrays["feature"].astype(np.int32),
+                "threshold": arrays["threshold"].astype(np.float32),
+                "left": arrays["left"].astype(np.int32),
+                "right": arrays["right"].astype(np.int32),
+                "default_left": arrays["default_left"].astype(bool),
+                "value": arrays["value"].astype(np.float32),
+            }
+
+        self.groups = []
+        for depth, roots in sorted(by_depth.items()):
+            if depth > self.max_padded_depth:
+                continue
+            n_inner, n_leaves = 2 ** depth - 1, 2 ** depth
+            # Padding nodes compare against +inf and default left, so every row goes left
+            feature = np.zeros((len(roots), n_inner), dtype=np.int32)
+            threshold = np.full((len(roots), n_inner), np.inf, dtype=np.float32)
+            default_left = np.ones((len(roots), n_inner), dtype=bool)
+            leaf_value = np.zeros((len(roots), n_leaves), dtype=np.float32)
+
+            for t, root in enumerate(roots):
+                stack = [(root, 0)]
+                while stack:
+                    node, pos = stack.pop()
+                    if pos >= n_inner:
+                        leaf_value[t, pos - n_inner] = arrays["value"][node]
+                    elif left[node] == node:
+                        # Leaf above the group depth: keep going left until the last level
+                        stack.append((node, 2 * pos + 1))
+                    else:
+                        feature[t, pos] = arrays["feature"][node]
+                        threshold[t, pos] = arrays["threshold"][node]
+                        default_left[t, pos] = arrays["default_left"][node]
+                        stack.append((int(left[node]), 2 * pos + 1))
+                        stack.append((int(right[node]), 2 * pos + 2))
+
+            self.groups.append({
+                "depth": depth,
+                "feature": feature.ravel(),
+                "threshold": threshold.ravel(),
+                "default_left": default_left.ravel(),
+                "leaf_value": leaf_value.ravel(),
+                "tree_inner": (np.arange(len(roots)) * n_inner).astype(np.int32),
+                "tree_leaf": (np.arange(len(roots)) * n_leaves - n_inner).astype(np.int32),
+            })
+
+    def _block_margin(self, X: np.ndarray) -> np.ndarray:
+        # Flat gathers into the row-major block are cheaper than take_along_axis
+        row_base = (np.arange(len(X), dtype=np.int32) * X.shape[1])[:, None]
+        flat = X.ravel()
+
+        margin = np.zeros(len(X), dtype=np.float32)
+        for g in self.groups:
+            pos = np.zeros((len(X), len(g["tree_inner"])), dtype=np.int32)
+            for _ in range(g["depth"]):
+                node = g["tree_inner"] + pos
+                values = np.take(flat, row_base + np.take(g["feature"], node))
+                goes_left = np.where(np.isnan(values), np.take(g["default_left"], node), values < np.take(g["threshold"], node))
+                pos = 2 * pos + 2 - goes_left
+            margin += np.take(g["leaf_value"], g["tree_leaf"] + pos).sum(axis=1, dtype=np.float32)
+
+        d = self.deep
+        if d is not None:
+            node = np.broadcast_to(d["roots"], (len(X), len(d["roots"])))
+            for _ in range(d["depth"]):
+                values = np.take(flat, row_base + np.take(d["feature"], node))
+                goes_left = np.where(np.isnan(values), np.take(d["default_left"], node), values < np.take(d["threshold"], node))
+                node = np.where(goes_left, np.take(d["left"], node), np.take(d["right"], node))
+            margin += np.take(d["value"], node).sum(axis=1, dtype=np.float32)
+
+        return margin
+
+    def predict_margin(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        margin = np.empty(X.shape[0], dtype=np.float32)
+        for start in range(0, X.shape[0], self.block_rows):
+            block = X[start:start + self.block_rows]
+            margin[start:start + len(block)] = self._block_margin(block)
+
+        return margin + self.base_margin
+
+    def predict_proba(self, X) -> np.ndarray:
+        # binary:logitraw only changes what XGBoost reports, the margin is a logit for both
+        p = 1.0 / (1.0 + np.exp(-self.predict_margin(X)))
+        return np.column_stack([1.0 - p, p])
@@ -0,0 +1,172 @@
+import json
+import numpy as np
+import pandas as pd
+
+# Optional binary formats, JSON always works
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MIME = "application/json"
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+MSGPACK_MIMES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+class UnsupportedMediaType(Exception):
+    pass
+
+class NotAcceptable(Exception):
+    pass
+
+def _media_type(header: str) -> str:
+    return (header or "").split(";")[0].strip().lower()
+
+def _require(module, name: str):
+    if module is None:
+        raise UnsupportedMediaType(f"{name} is not installed on the server, use {JSON_MIME}")
+
+def decode_columns(body: bytes, content_type: str = None) -> dict:
+    """
+    Request body -> {field: column array} for the batch encoder.
+
+    Arrow IPC record batches come back as numpy arrays; numeric columns
+    without nulls in a single chunk are zero-copy views of the Arrow
+    buffers, and dictionary-encoded string columns become pd.Categorical
+    (codes + levels) so the encoder never materializes per-row strings.
+    msgpack and JSON carry {"columns": {field: [values]}} (or the
+    bare column mapping).
+    """
+    media_type = _media_type(content_type) or JSON_MIME
+
+    if media_type == ARROW_MIME:
+        _require(pa, "pyarrow")
+        table = pa.ipc.open_stream(body).read_all()
+        columns = {}
+        for name, col in zip(table.column_names, table.columns):
+            if pa.types.is_dictionary(col.type):
+                col = col.unify_dictionaries().combine_chunks()
+                columns[name] = pd.Categorical.from_codes(
+                    col.indices.fill_null(-1).to_numpy(zero_copy_only=False),
+                    categories=col.dictionary.to_numpy(zero_copy_only=False),
+                )
+                continue
+            if col.num_chunks == 1:
+                col = col.chunk(0)
+            columns[name] = col.to_numpy(zero_copy_only=False)
+        return columns
+
+    if media_type in MSGPACK_MIMES:
+        _require(msgpack, "msgpack")
+        payload = msgpack.unpackb(body, raw=False)
+    elif media_type == JSON_MIME:
+        payload = json.loads(body)
+    else:
+        raise UnsupportedMediaType(f"Unsupported content type : {media_type}")
+
+    columns = payload.get("columns", payload) if isinstance(payload, dict) else None
+    if not isinstance(columns, dict):
+        raise ValueError("Expected an object of column arrays")
+    return columns
+
+def _parse_accept(accept: str) -> list:
+    # [(media_type, q)] in header order, q=0 entries are refusals
+    entries = []
+    for part in (accept or "").split(","):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        entries.append((media_type.lower(), q))
+    return entries
+
+def negotiate(accept: str = None) -> str:
+    """
+    Response media type from the Accept header.
+
+    Picks the supported type with the highest q-value (header order breaks
+    ties); wildcards resolve to JSON unless it is refused with q=0. Raises
+    NotAcceptable when nothing asked for can be served, e.g. Arrow without
+    pyarrow installed.
+    """
+    entries = _parse_accept(accept)
+    if not entries:
+        return JSON_MIME
+
+    supported = [JSON_MIME]
+    if msgpack is not None:
+        supported += MSGPACK_MIMES
+    if pa is not None:
+        supported.append(ARROW_MIME)
+    refused = {m for m, q in entries if q <= 0}
+    supported = [m for m in supported if m not in refused]
+
+    def _match(media_type):
+        if media_type in ("*/*", "application/*"):
+            return supported[0] if supported else None
+        return media_type if media_type in supported else None
+
+    best, best_q = None, 0.0
+    for media_type, q in entries:
+        match = _match(media_type)
+        if match is not None and q > best_q:
+            best, best_q = match, q
+    if best is not None:
+        return best
+
+    asked = {m for m, q in entries if q > 0}
+    missing = [name for name, module, mimes in (("pyarrow", pa, (ARROW_MIME,)), ("msgpack", msgpack, MSGPACK_MIMES))
+               if module is None and asked.intersection(mimes)]
+    if missing:
+        raise NotAcceptable(f"{', '.join(missing)} is not installed on the server, accept {JSON_MIME}")
+    raise NotAcceptable(f"None of the accepted types can be served : {accept}. Use {JSON_MIME}, {ARROW_MIME} or {MSGPACK_MIMES[0]}")
+
+def _to_list(values) -> list:
+    # NaN / None -> null for JSON and msgpack
+    out = values.tolist() if isinstance(values, np.ndarray) else list(values)
+    return [None if v is None or (isinstance(v, float) and v != v) else v for v in out]
+
+def encode_result(result: dict, media_type: str) -> bytes:
+    """
+    Serialize a batch result ({"prediction", "churn_probability"} column
+    arrays plus counts and row errors) in the negotiated format.
+
+    Arrow responses carry the columns as a record batch; counts and errors
+    go into the schema metadata.
+    """
+    if media_type == ARROW_MIME:
+        batch = pa.record_batch(
+            [
+                pa.array(result["prediction"], type=pa.string()),
+                pa.array(result["churn_probability"], type=pa.float64(), from_pandas=True),
+            ],
+            names=["prediction", "churn_probability"],
+        )
+        batch = batch.replace_schema_metadata({
+            "n_rows": str(result["n_rows"]),
+            "n_valid": str(result["n_valid"]),
+            "errors": json.dumps(result["errors"]),
+        })
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+
+    payload = dict(result)
+    payload["prediction"] = _to_list(result["prediction"])
+    payload["churn_probability"] = _to_list(result["churn_probability"])
+
+    if media_type in MSGPACK_MIMES:
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload).encode()
@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import cProfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def _rss_mb() -> float:
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2**20
+    return _max_rss_mb()
+
+def _max_rss_mb() -> float:
+    # High-water mark of the process, KB on Linux and bytes on macOS
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+class _RssSampler(threading.Thread):
+    """
+    Polls the resident set size while a stage runs, so the peak of each
+    stage is seen even when it stays below the process high-water mark.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = _rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, _rss_mb())
+
+    def stop(self) -> float:
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, _rss_mb())
+        return self.peak
+
+class StageProfiler:
+    """
+    Records wall time, CPU time, peak RSS growth and rows/sec per pipeline stage.
+
+    With profile_dir set every stage also runs under cProfile and is dumped
+    to <profile_dir>/<run>/<nn>_<stage>.prof (pstats format: snakeviz,
+    flameprof, python -m pstats). Each profiler gets its own <run> folder,
+    so dumps of earlier runs are never overwritten or logged again.
+    """
+
+    def __init__(self, logger=None, profile_dir: str = None):
+        self.logger = logger
+        self.profile_dir = None
+        self.stages = []
+        if profile_dir:
+            # Suffixed -1, -2, ... when another profiler started in the same second
+            base = os.path.join(profile_dir, time.strftime("run-%Y%m%d-%H%M%S") + f"-{os.getpid()}")
+            path, n = base, 0
+            while True:
+                try:
+                    os.makedirs(path)
+                    break
+                except FileExistsError:
+                    n += 1
+                    path = f"{base}-{n}"
+            self.profile_dir = path
+
+    @contextmanager
+    def stage(self, name: str, rows: int = None):
+        """
+        Profile the enclosed block. Yields the stage record, set record["rows"]
+        inside the block when the row count is only known at the end.
+        """
+        record = {"stage": name, "rows": rows}
+        sampler = _RssSampler() if psutil is not None else None
+        rss_start = _rss_mb()
+        peak_start = _max_rss_mb()
+        profiler = cProfile.Profile() if self.profile_dir else None
+
+        if sampler is not None:
+            sampler.start()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record["wall_s"] = time.perf_counter() - wall_start
+            record["cpu_s"] = time.process_time() - cpu_start
+            if sampler is not None:
+                record["peak_rss_delta_mb"] = max(sampler.stop() - rss_start, 0.0)
+            else:
+                record["peak_rss_delta_mb"] = max(_max_rss_mb() - peak_start, 0.0)
+            rows = record["rows"]
+            record["rows_per_s"] = rows / record["wall_s"] if rows and record["wall_s"] > 0 else None
+
+            if profiler is not None:
+                path = os.path.join(self.profile_dir, f"{len(self.stages):02d}_{name}.prof")
+                profiler.dump_stats(path)
+                record["profile"] = path
+
+            self.stages.append(record)
+            self._log(record)
+
+    def _log(self, r: dict):
+        message = f"stage={r['stage']} wall={r['wall_s']:.3f}s cpu={r['cpu_s']:.3f}s peak_rss_delta={r['peak_rss_delta_mb']:.1f}MB"
+        if r["rows_per_s"] is not None:
+            message += f" rows={r['rows']} rows_per_s={r['rows_per_s']:.0f}"
+        if self.logger is not None:
+            self.logger.info(message)
+
+    def metrics(self) -> dict:
+        """
+        Flat {metric: value} for mlflow.log_metrics, one set per stage
+        """
+        out = {}
+        for r in self.stages:
+            for key in ("wall_s", "cpu_s", "peak_rss_delta_mb", "rows_per_s"):
+                if r[key] is not None:
+                    out[f"stage_{r['stage']}_{key}"] = r[key]
+        out["stage_total_wall_s"] = sum(r["wall_s"] for r in self.stages)
+        return out
+
+    def summary(self) -> str:
+        lines = [f" {'stage':<18} {'wall s':>8} {'cpu s':>8} {'peak MB':>8} {'rows/s':>12}"]
+        for r in self.stages:
+            rows_per_s = f"{r['rows_per_s']:.0f}" if r["rows_per_s"] is not None else "-"
+            lines.append(f" {r['stage']:<18} {r['wall_s']:>8.3f} {r['cpu_s']:>8.3f} {r['peak_rss_delta_mb']:>8.1f} {rows_per_s:>12}")
+        return "\n".join(lines)
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump({"stages": self.stages}, f, indent=2)
+
+    def log_to_mlflow(self, mlflow, artifact_file: str = "stage_profile.json"):
+        """
+        Stage metrics plus the full table as a JSON artifact (and this run's .prof dumps if any)
+        """
+        mlflow.log_metrics(self.metrics())
+        mlflow.log_dict({"stages": self.stages}, artifact_file)
+        for r in self.stages:
+            if r.get("profile"):
+                mlflow.log_artifact(r["profile"], artifact_path="profiles")
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+# Allowed levels for every categorical input field (shared by the Great
+# Expectations suite, the API models and the vectorized batch validator)
+ALLOWED_VALUES = {
+    "gender": ["Male", "Female"],
+    "Partner": ["Yes", "No"],
+    "Dependents": ["Yes", "No"],
+    "PhoneService": ["Yes", "No"],
+    "MultipleLines": ["Yes", "No", "No phone service"],
+    "InternetService": ["DSL", "Fiber optic", "No"],
+    "OnlineSecurity": ["Yes", "No", "No internet service"],
+    "OnlineBackup": ["Yes", "No", "No internet service"],
+    "DeviceProtection": ["Yes", "No", "No internet service"],
+    "TechSupport": ["Yes", "No", "No internet service"],
+    "StreamingTV": ["Yes", "No", "No internet service"],
+    "StreamingMovies": ["Yes", "No", "No internet service"],
+    "Contract": ["Month-to-month", "One year", "Two year"],
+    "PaperlessBilling": ["Yes", "No"],
+    "PaymentMethod": [
+        "Electronic check", "Mailed check",
+        "Bank transfer (automatic)", "Credit card (automatic)",
+    ],
+}
+
+# (min, max) business ranges for numeric input fields, None means unbounded
+NUMERIC_RANGES = {
+    "SeniorCitizen": (0, 1),
+    "tenure": (0, 120),
+    "MonthlyCharges": (0, 200),
+    "TotalCharges": (0, None),
+}
+
+# Numeric fields that must not be missing
+REQUIRED_NUMERIC = ["tenure", "MonthlyCharges"]
+
+def source_field(col: str) -> str:
+    """
+    Input field an encoded model column comes from: the field itself, or the
+    <field> of a "<field>_<level>" one-hot column. Engineered columns that
+    match no input field (e.g. No_internet_service) keep their full name.
+    """
+    fields = list(ALLOWED_VALUES) + list(NUMERIC_RANGES)
+    if col in fields:
+        return col
+    matches = [f for f in fields if col.startswith(f + "_")]
+    return max(matches, key=len) if matches else col
+
+def _as_column(field: str, values, dtype=None):
+    # One flat array per field; scalars and nested lists are payload errors, not row errors
+    if isinstance(values, pd.Categorical):
+        return values
+    if not isinstance(values, (list, tuple, np.ndarray)):
+        raise ValueError(f"Field {field} must be an array of values, got {type(values).__name__}")
+    try:
+        values = np.asarray(values, dtype=dtype)
+    except (TypeError, ValueError):
+        values = None
+    if values is None or values.ndim != 1:
+        raise ValueError(f"Field {field} must be a flat array of scalar values")
+    return values
+
+def validate_columns(columns: dict, max_errors: int = 1000):
+    """
+    Vectorized validation of a column-oriented batch {field: [values, ...]}.
+
+    Returns (valid_mask, errors) where errors lists the first `max_errors`
+    problems as {"row", "field", "value", "error"}. Raises ValueError when
+    the payload itself is malformed (missing fields, scalar or nested
+    fields, ragged columns).
+    """
+    fields = list(ALLOWED_VALUES) + list(NUMERIC_RANGES)
+    missing = [f for f in fields if f not in columns]
+    if missing:
+        raise ValueError(f"Missing fields : {missing}")
+
+    columns = {f: _as_column(f, columns[f], dtype=object if f in ALLOWED_VALUES else None) for f in fields}
+    lengths = {len(columns[f]) for f in fields}
+    if len(lengths) != 1:
+        raise ValueError("All columns must have the same length")
+    n = lengths.pop()
+
+    valid = np.ones(n, dtype=bool)
+    errors = []
+
+    def _collect(bad, field, values, message):
+        rows = np.flatnonzero(bad)
+        for r in rows[: max(max_errors - len(errors), 0)]:
+            v = values[r]
+            v = v.item() if hasattr(v, "item") else v
+            errors.append({"row": int(r), "field": field, "value": None if v is None or (np.isscalar(v) and pd.isna(v)) else v, "error": message})
+
+    for field, allowed in ALLOWED_VALUES.items():
+        values = pd.Series(columns[field])
+        bad = ~values.isin(allowed).to_numpy()
+        if bad.any():
+            valid &= ~bad
+            _collect(bad, field, values.to_numpy(), f"must be one of {allowed}")
+
+    for field, (lo, hi) in NUMERIC_RANGES.items():
+        raw = columns[field]
+        if raw.dtype.kind in "biuf":
+            # Typed arrays (e.g. decoded Arrow columns) need no per-value parsing
+            values = raw.astype(float, copy=False)
+            missing_value = np.isnan(values)
+            bad_type = np.zeros(n, dtype=bool)
+        else:
+            raw = raw.astype(object)
+            values = pd.to_numeric(pd.Series(raw), errors="coerce").to_numpy(dtype=float)
+            missing_value = np.isnan(values)
+            bad_type = missing_value & pd.notna(raw)
+        bad = bad_type | ((values < lo) if lo is not None else False) | ((values > hi) if hi is not None else False)
+        if field in REQUIRED_NUMERIC:
+            bad |= missing_value
+        if field == "SeniorCitizen":
+            bad |= ~missing_value & (values != np.round(values))
+        if bad.any():
+            valid &= ~bad
+            _collect(bad, field, raw, f"must be a number in range [{lo}, {hi if hi is not None else 'inf'}]")
+
+    return valid, errors
@@ -2,6 +2,8 @@ import great_expectations as ge
 from typing import Tuple, List
 import pandas as pd
 
+from .schema import ALLOWED_VALUES, NUMERIC_RANGES, REQUIRED_NUMERIC
+
 def validate_telco_data(df) -> Tuple[bool, List[str]]:
     """
     Comperhensive Data Validation for the Telcom Customer Churn using Great Expectations
@@ -31,25 +33,9 @@ def validate_telco_data(df) -> Tuple[bool, List[str]]:
     ge_df.expect_column_to_exist("MonthlyCharges")
     ge_df.expect_column_to_exist("TotalCharges")
 
-    # Gender must be one of expected values (data integrity)
-    ge_df.expect_column_values_to_be_in_set("gender", ["Male", "Female"])
-    
-    # Yes/No fields must have valid values
-    ge_df.expect_column_values_to_be_in_set("Partner", ["Yes", "No"])
-    ge_df.expect_column_values_to_be_in_set("Dependents", ["Yes", "No"])
-    ge_df.expect_column_values_to_be_in_set("PhoneService", ["Yes", "No"])
-    
-    # Contract types must be valid (business constraint)
-    ge_df.expect_column_values_to_be_in_set(
-        "Contract", 
-        ["Month-to-month", "One year", "Two year"]
-    )
-    
-    # Internet service types (business constraint)
-    ge_df.expect_column_values_to_be_in_set(
-        "InternetService",
-        ["DSL", "Fiber optic", "No"]
-    )
+    # Categorical fields must use the known levels (data integrity / business constraints)
+    for column, allowed in ALLOWED_VALUES.items():
+        ge_df.expect_column_values_to_be_in_set(column, allowed)
     
     print("  Validating numeric ranges and business constraints...")
     
@@ -68,15 +54,13 @@ def validate_telco_data(df) -> Tuple[bool, List[str]]:
     # STATISTICAL VALIDATION 
     print("  Validating statistical properties...")
     
-    # Tenure should be reasonable (max ~10 years = 120 months for telecom)
-    ge_df.expect_column_values_to_be_between("tenure", min_value=0, max_value=120)
-    
-    # Monthly charges should be within reasonable business range
-    ge_df.expect_column_values_to_be_between("MonthlyCharges", min_value=0, max_value=200)
+    # Reasonable business ranges (e.g. tenure max ~10 years = 120 months for telecom)
+    for column, (min_value, max_value) in NUMERIC_RANGES.items():
+        ge_df.expect_column_values_to_be_between(column, min_value=min_value, max_value=max_value)
     
     # No missing values in critical numeric features  
-    ge_df.expect_column_values_to_not_be_null("tenure")
-    ge_df.expect_column_values_to_not_be_null("MonthlyCharges")
+    for column in REQUIRED_NUMERIC:
+        ge_df.expect_column_values_to_not_be_null(column)
 
     print(" Validating  Data Consistency .. ")
 